@@ -1,9 +1,11 @@
 import time
 import cv2 as cv
-import pyautogui
+import numpy as np
+from typing import List, Optional, Tuple, Union
 from camera import Camera
 from hand_tracker import HandTracker
 from controller import ComputerInputController
+from multi_camera import MultiCameraTracker
 from self_segmentation import SelfSegmentationTools
 
 class HandControlApp:
@@ -14,16 +16,51 @@ class HandControlApp:
     - keyboard (run_keyboard)
     """
 
-    def __init__(self):
-        self.camera = Camera()
-        self.detector = HandTracker(mode='video', num_hands=1,
-                                    min_hand_detection_confidence=0.5, # lower precision -> faster tracking
-                                    min_hand_presence_confidence=0.5,
-                                    min_tracking_confidence=0.5)
+    def __init__(self, sources:Optional[List[Union[int, str]]]=None, fusion:str='average'):
+        """
+        Args:
+            sources (List[int | str]): Camera device indices or video files (default: camera 0).
+                With several sources, each camera runs its own HandTracker in parallel
+                and the landmarks are fused (see MultiCameraTracker).
+            fusion (str): Multi-camera fusion method - 'select' or 'average'.
+        """
+        sources = sources or [0]
+        tracker_options = dict(num_hands=1,
+                               min_hand_detection_confidence=0.5, # lower precision -> faster tracking
+                               min_hand_presence_confidence=0.5,
+                               min_tracking_confidence=0.5)
+        if len(sources) == 1:
+            self.multi_camera = None
+            self.camera = Camera(sources[0])
+            self.detector = HandTracker(mode='video', **tracker_options)
+        else:
+            self.camera = None
+            self.multi_camera = MultiCameraTracker(sources, fusion, **tracker_options)
+            # the fused landmarks are fed to this tracker - no model needed
+            self.detector = HandTracker(model_path=None, mode='video')
         self.controller = ComputerInputController()
         # self.segmenter_tool = SelfSegmentationTools() # to be explored
 
-    def run_controller_for_game(self, minimum_hand_score:float=0.5, skip_frame:bool=True):
+    def read_frame(self) -> Tuple[bool, np.ndarray]:
+        """
+        Capture the next frame and update the detector results.
+
+        With several cameras, waits for the next detection of every camera and
+        feeds the fused landmarks (and the frame aspect ratio) to the detector.
+
+        Returns:
+            Tuple[bool, np.ndarray]:
+                - success (bool): True if a frame was read.
+                - frame (np.ndarray): The captured BGR image.
+        """
+        if self.multi_camera is not None:
+            return self.multi_camera.update(self.detector)
+        ret, frame = self.camera.read()
+        if ret:
+            self.detector.get_results(frame)
+        return ret, frame
+
+    def run_controller_for_game(self, minimum_hand_score:float=0.5, skip_frame:bool=True, joint_angles:bool=False):
         """
         Hand-based game controller.
 
@@ -35,6 +72,9 @@ class HandControlApp:
                 Minimum confidence score required to consider the hand detection valid.
             skip_frame (bool):
                 If True, processes every other frame to reduce latency and CPU usage.
+            joint_angles (bool):
+                If True, uses the 3D joint angles (HandTracker.finger_states), which
+                work for any hand orientation, instead of the image-axis test.
         """
         commands = {
             'index': 'space',
@@ -43,32 +83,38 @@ class HandControlApp:
             'middle': 'w'
         }
         key_states = {finger: False for finger in commands}
+        finger_columns = {finger: i for i, finger in enumerate(HandTracker.FINGER_INDEX)}
         input('Press ENTER to start the controller:\n')
         frame_count = 0
         while True:
-            ret, frame = self.camera.read()
+            ret, frame = self.read_frame()
             frame_count += 1
             if not ret:
                 print('Failed to read frame')
                 break
-            self.detector.get_results(frame)
 
             if not self.detector.update_knuckles_coordinates(minimum_hand_score, verbose=False) or (skip_frame and frame_count % 2 != 0):
                 continue
 
+            if joint_angles:
+                finger_states = self.detector.finger_states()
             for finger, key in commands.items():
-                extended = self.detector.is_finger_extended(finger)
+                if joint_angles:
+                    extended = finger_states[finger_columns[finger]]
+                else:
+                    extended = self.detector.is_finger_extended(finger)
                 # PRESS once
                 if extended and not key_states[finger]:
-                    pyautogui.keyDown(key)
+                    self.controller.key_down(key)
                     key_states[finger] = True
                 # RELEASE once
                 elif not extended and key_states[finger]:
-                    pyautogui.keyUp(key)
+                    self.controller.key_up(key)
                     key_states[finger] = False
         self.cleanup()
 
-    def run_computer_interface(self, minimum_hand_score:float=0.3):
+    def run_computer_interface(self, minimum_hand_score:float=0.3, cursor_rate:Optional[float]=None,
+                               joint_angles:bool=False):
         """
         Hand-gesture-based computer interface.
 
@@ -86,16 +132,26 @@ class HandControlApp:
             minimum_hand_score (float):
                 Minimum confidence score required to accept hand detection.
                 Frames below this threshold are ignored.
+            cursor_rate (float):
+                If set, the cursor is moved from a background thread at this rate (Hz),
+                interpolating between camera frames (e.g. the display refresh rate).
+            joint_angles (bool):
+                If True, the finger tests (move, scroll, right click) use the 3D joint
+                angles (HandTracker.finger_states) instead of the image-axis tests.
+                The left click stays distance-based - a pinch is the thumb tip touching
+                the index tip, not a flexion state of either finger.
         """
+        if cursor_rate is not None:
+            self.controller.start_cursor_output(cursor_rate)
         lmb_pressed = False
         rmb_pressed = False
         index_beta = 0.22
+        finger_columns = {finger: i for i, finger in enumerate(HandTracker.FINGER_INDEX)}
         while True:
-            ret, frame = self.camera.read()
+            ret, frame = self.read_frame()
             if not ret:
                 print("Failed to read frame")
                 break
-            self.detector.get_results(frame)
 
             cv.imshow("Camera", frame)
             # Stop with space key
@@ -105,31 +161,44 @@ class HandControlApp:
             if not self.detector.update_knuckles_coordinates(minimum_hand_score, verbose=False):
                 continue    
             
-            if self.detector.is_two_finger_extended(['index', 'middle'], 0.2):
+            if joint_angles:
+                finger_states = self.detector.finger_states()
+                index_extended = finger_states[finger_columns['index']]
+                scrolling = index_extended and finger_states[finger_columns['middle']]
+                rmb_status = finger_states[finger_columns['pinky']]
+            else:
+                index_extended = self.detector.is_finger_extended('index', index_beta) # It doesn't work when pincer grasp
+                scrolling = self.detector.is_two_finger_extended(['index', 'middle'], 0.2)
+                rmb_status = self.detector.is_finger_extended('pinky', 0.1)
+
+            if scrolling:
                 x_scroll, y_scroll, _ = self.detector.HAND_KNUCKLES_COORDINATES[12]
                 self.controller.scroll(x_scroll, y_scroll)
                 continue
-            elif self.detector.is_finger_extended('index', index_beta): # It doesn't work when pincer grasp
+            elif index_extended:
                 x, y, _ = self.detector.HAND_KNUCKLES_COORDINATES[8]
                 self.controller.smooth_move(x, y)
 
             # LMB click
             pinched = self.detector.is_tweezers(0.04)
             if pinched and not lmb_pressed:
-                pyautogui.mouseDown(button='left')
+                self.controller.mouse_down('left')
                 lmb_pressed = True
             elif not pinched and lmb_pressed:
-                pyautogui.mouseUp(button='left')
+                self.controller.mouse_up('left')
                 lmb_pressed = False
             
             # RMB click
-            rmb_status = self.detector.is_finger_extended('pinky', 0.1)
             if  rmb_status and not rmb_pressed:
-                pyautogui.rightClick()
+                self.controller.right_click()
                 rmb_pressed = True
             elif not rmb_status and rmb_pressed:
                 rmb_pressed = False
 
+        if cursor_rate is not None:
+            self.controller.stop_cursor_output()
+            for name, value in self.controller.cursor_output_stats().items():
+                print(f"{name:>18} : {value:.2f}")
         self.cleanup()
 
     # TODO - Next method (NOT STARTED)
@@ -149,11 +218,10 @@ class HandControlApp:
         """
         
         while True:
-            ret, frame = self.camera.read()
+            ret, frame = self.read_frame()
             if not ret:
                 print("Failed to read frame")
                 break
-            self.detector.get_results(frame)
 
             cv.imshow("Camera", frame)
             if cv.waitKey(1) != -1:
@@ -177,7 +245,12 @@ class HandControlApp:
         
 
     def cleanup(self):
-        self.camera.release()
+        self.controller.stop_cursor_output()
+        if self.multi_camera is not None:
+            self.multi_camera.release()
+            self.multi_camera.print_stats()
+        else:
+            self.camera.release()
         self.detector.close()
         cv.destroyAllWindows()
 
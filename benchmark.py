@@ -0,0 +1,489 @@
+import gc
+import sys
+import time
+import argparse
+import itertools
+import tracemalloc
+import cv2 as cv
+import numpy as np
+from typing import Callable, Dict, List
+
+def load_video_frames(video_path: str, max_frames: int = 300) -> List[np.ndarray]:
+    """
+    Decode a recorded video into memory so it can be replayed frame by frame.
+
+    Frames are decoded up front, so the cost of decoding does not show up
+    in the measured frame loop.
+
+    Args:
+        video_path (str): Path to the recorded video file.
+        max_frames (int): Maximum number of frames to load.
+
+    Returns:
+        List[np.ndarray]: Decoded BGR frames.
+    """
+    cap = cv.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise RuntimeError(f"Could not open video {video_path}")
+    frames = []
+    while len(frames) < max_frames:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+def measure_frame_allocations(step: Callable[[np.ndarray], None], frames: List[np.ndarray],
+                              warmup: int = 30) -> Dict[str, float]:
+    """
+    Measure the memory allocated by a per-frame callable, frame by frame.
+
+    Tracemalloc runs for the whole replay (warmup included). The first `warmup`
+    frames fill the reusable buffers (RGB frame, landmark coordinates, ...).
+    For every measured frame the traced peak is reset before calling `step`,
+    so the peak above the memory in use at that moment is the memory the frame
+    allocated - even when it is freed again before the frame ends.
+
+    After each frame, outside the measured window, the youngest generation of
+    the garbage collector is collected: the objects it frees are the cyclic
+    garbage of the frame (what eventually triggers automatic collections), and
+    the Python memory blocks still allocated (sys.getallocatedblocks) are the
+    objects the frame kept alive.
+
+    Args:
+        step (Callable): Function that processes a single frame (measured).
+        frames (List[np.ndarray]): Recorded frames to replay.
+        warmup (int): Number of frames processed before measuring.
+
+    Returns:
+        Dict[str, float]:
+            - frames: number of measured frames
+            - max_transient_bytes: largest allocation peak of a single frame
+            - mean_transient_bytes: mean allocation peak per frame
+            - retained_bytes_per_frame: mean memory still alive after each frame
+            - objects_per_frame: mean number of memory blocks still alive after each frame
+            - garbage_per_frame: mean number of cyclic garbage objects left by each frame
+            - gc_collections: automatic garbage collector runs during the measured frames
+            - fps: processed frames per second (slowed down by tracemalloc)
+    """
+    if len(frames) <= warmup:
+        raise ValueError("Not enough frames - need more frames than the warmup.")
+    measured = frames[warmup:]
+    transient = np.zeros(len(measured))
+    retained = np.zeros(len(measured))
+    objects = np.zeros(len(measured))
+    garbage = np.zeros(len(measured))
+
+    # automatic collections only - [count, collecting between frames]
+    collections = [0, False]
+    def on_gc(phase: str, info: dict) -> None:
+        if phase == 'start' and not collections[1]:
+            collections[0] += 1
+
+    tracemalloc.start()
+    try:
+        for frame in frames[:warmup]:
+            step(frame)
+        gc.collect()
+        gc.callbacks.append(on_gc)
+        start = time.perf_counter()
+        for i, frame in enumerate(measured):
+            blocks = sys.getallocatedblocks()
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            step(frame)
+            after, peak = tracemalloc.get_traced_memory()
+            collections[1] = True
+            garbage[i] = gc.collect(0)
+            collections[1] = False
+            # minus one: the int holding the first count
+            blocks = sys.getallocatedblocks() - blocks - 1
+            transient[i] = peak - current
+            retained[i] = after - current
+            objects[i] = blocks
+        elapsed = time.perf_counter() - start
+        gc.callbacks.remove(on_gc)
+    finally:
+        tracemalloc.stop()
+
+    n = len(measured)
+    return {
+        'frames': n,
+        'max_transient_bytes': float(transient.max()),
+        'mean_transient_bytes': float(transient.mean()),
+        'retained_bytes_per_frame': float(retained.mean()),
+        'objects_per_frame': float(objects.mean()),
+        'garbage_per_frame': float(garbage.mean()),
+        'gc_collections': collections[0],
+        'fps': n / elapsed if elapsed > 0 else float('inf'),
+    }
+
+def check_allocation_budget(stats: Dict[str, float], max_transient_bytes: float,
+                            max_objects_per_frame: float) -> bool:
+    """
+    Print the allocation statistics and check them against the budget.
+
+    Returns:
+        bool: True if the frame loop is within budget.
+    """
+    for name, value in stats.items():
+        print(f"{name:>24} : {value:.2f}")
+    passed = True
+    if stats['max_transient_bytes'] > max_transient_bytes:
+        print(f"FAIL - {stats['max_transient_bytes']:.0f} bytes allocated in a frame > {max_transient_bytes:.0f}")
+        passed = False
+    if stats['objects_per_frame'] > max_objects_per_frame:
+        print(f"FAIL - {stats['objects_per_frame']:.2f} objects kept per frame > {max_objects_per_frame:.2f}")
+        passed = False
+    if stats['gc_collections'] != 0:
+        print(f"FAIL - {stats['gc_collections']} garbage collections during the measured frames")
+        passed = False
+    return passed
+
+class RecordedDetector:
+    """
+    Stand-in for the MediaPipe landmarker that replays precomputed results.
+
+    Assigned to HandTracker.detector, so the allocation gate measures the whole
+    public frame loop (get_results included) except the inference itself.
+    """
+
+    def __init__(self, results: List):
+        self._results = itertools.cycle(results)
+
+    def detect_for_video(self, image, timestamp_ms: int):
+        return next(self._results)
+
+    def close(self) -> None:
+        pass
+
+def mouse_control_step(detector, controller, min_score: float) -> Callable[[np.ndarray], None]:
+    """
+    Per-frame body of the mouse control loop (HandTracker -> ComputerInputController),
+    as in HandControlApp.run_computer_interface.
+    """
+    def step(frame: np.ndarray) -> None:
+        detector.get_results(frame)
+        if not detector.update_knuckles_coordinates(min_score, verbose=False):
+            return
+        if detector.is_finger_extended('index', 0.22):
+            x, y, _ = detector.HAND_KNUCKLES_COORDINATES[8]
+            controller.smooth_move(x, y)
+    return step
+
+def run_allocations(args: argparse.Namespace) -> int:
+    """
+    Replay a recorded video through the mouse control loop and check the allocation budget.
+
+    The video goes through the MediaPipe landmarker first. The measured replay then
+    runs the same frames through get_results, update_knuckles_coordinates,
+    is_finger_extended and smooth_move, with the landmarker replaced by a
+    RecordedDetector - only detect_for_video is left out of the budget.
+    pyautogui.moveTo is measured (and moves the cursor).
+    """
+    from hand_tracker import HandTracker
+    from controller import ComputerInputController
+
+    frames = load_video_frames(args.video, args.max_frames)
+    detector = HandTracker(model_path=args.model, mode='video', num_hands=1,
+                           min_hand_detection_confidence=0.5,
+                           min_hand_presence_confidence=0.5,
+                           min_tracking_confidence=0.5)
+    results = [detector.get_results(frame) for frame in frames]
+    landmarker = detector.detector
+    detector.detector = RecordedDetector(results)
+    step = mouse_control_step(detector, ComputerInputController(), args.min_score)
+    try:
+        stats = measure_frame_allocations(step, frames, args.warmup)
+    finally:
+        detector.detector = landmarker
+        detector.close()
+    passed = check_allocation_budget(stats, args.max_transient_bytes, args.max_objects_per_frame)
+    return 0 if passed else 1
+
+def run_allocations_check(args: argparse.Namespace) -> int:
+    """
+    Check that the allocation gate works, without model or video.
+
+    Replays synthetic HD frames and landmarks (RecordedDetector) through:
+    - the current mouse control loop (must pass)
+    - a copy of the previous implementation - new RGB frame, new list of 21
+      tuples and np.clip on every frame (must fail on the transient bytes)
+    - the current loop keeping a trail of cursor positions (must fail on the
+      objects kept per frame)
+
+    Like the real loop, smooth_move moves the cursor.
+    """
+    from mediapipe import Image, ImageFormat
+    from hand_tracker import HandTracker
+    from controller import ComputerInputController
+    from synthetic_hands import HandPoseGenerator
+
+    frames = [np.zeros((720, 1280, 3), dtype=np.uint8)] * args.frames
+    detector = HandTracker(model_path=None, mode='video')
+    hands = HandPoseGenerator(seed=0, extended_rate=1.0, pinch_rate=0.0).sample(1).landmarks[0]
+    detector.detector = RecordedDetector([detector.set_landmarks(hands)])
+    controller = ComputerInputController()
+    step = mouse_control_step(detector, controller, 0.0)
+
+    def previous_step(frame: np.ndarray) -> None:
+        # rebinds the coordinates to tuples - restored below for the next loop
+        image = Image(image_format=ImageFormat.SRGB, data=cv.cvtColor(frame, cv.COLOR_BGR2RGB))
+        detector.results = detector.detector.detect_for_video(image, 0)
+        detector.HAND_KNUCKLES_COORDINATES = [
+            (landmark.x, landmark.y, landmark.z)
+            for landmark in detector.results.hand_landmarks[0]
+            ]
+        x, y, _ = detector.HAND_KNUCKLES_COORDINATES[8]
+        x = np.clip(x, 0.15, 0.85)
+        y = np.clip(y, 0.45, 0.55)
+
+    trail = []
+    def trail_step(frame: np.ndarray) -> None:
+        step(frame)
+        x, y, _ = detector.HAND_KNUCKLES_COORDINATES[8]
+        trail.append([x * controller.screen_w, y * controller.screen_h])
+
+    passed = []
+    for name, loop in (("Current frame loop", step),
+                       ("Previous frame loop (must fail)", previous_step),
+                       ("Frame loop keeping a cursor trail (must fail)", trail_step)):
+        print(f"{name}")
+        detector.HAND_KNUCKLES_COORDINATES = []
+        stats = measure_frame_allocations(loop, frames, args.warmup)
+        passed.append(check_allocation_budget(stats, args.max_transient_bytes, args.max_objects_per_frame))
+        print()
+    if not passed[0]:
+        print("FAIL - the current frame loop is over the allocation budget")
+        return 1
+    if any(passed[1:]):
+        print("FAIL - the gate does not catch every over-budget loop")
+        return 1
+    print("OK")
+    return 0
+
+def parse_floats(text: str) -> List[float]:
+    """
+    Parse a comma separated list of floats (command line helper).
+    """
+    return [float(value) for value in text.split(',')]
+
+def parse_ints(text: str) -> List[int]:
+    """
+    Parse a comma separated list of integers (command line helper).
+    """
+    return [int(value) for value in text.split(',')]
+
+def run_gestures(args: argparse.Namespace) -> int:
+    """
+    Drive the gesture functions with synthetic hands:
+    - correctness: batch implementations must match the per-hand methods
+    - throughput: hands per second of both implementations
+    - accuracy sweeps of the `beta` and tweezers thresholds against the ground truth
+    """
+    from hand_tracker import HandTracker
+    from synthetic_hands import FINGERS, HandPoseGenerator
+
+    generator = HandPoseGenerator(seed=args.seed, max_roll=args.max_roll, max_pitch=args.max_pitch,
+                                  max_yaw=args.max_yaw, left_hand_rate=args.left_hand_rate,
+                                  noise=args.noise, occlusion_rate=args.occlusion_rate)
+    betas = args.betas
+    pinch_thresholds = args.pinch_thresholds
+
+    # reference implementation - the per-hand methods used by the live loop
+    tracker = HandTracker(model_path=None)
+    hands = generator.sample(args.reference_hands)
+    landmarks = hands.landmarks.astype(np.float64)
+    reference = np.empty((len(landmarks), len(FINGERS) + 1), dtype=bool)
+    start = time.perf_counter()
+    for i, hand in enumerate(landmarks):
+        tracker.set_landmarks(hand)
+        tracker.update_knuckles_coordinates(0.0, verbose=False)
+        for j, finger in enumerate(FINGERS):
+            reference[i, j] = tracker.is_finger_extended(finger, args.beta)
+        reference[i, -1] = tracker.is_tweezers(args.pinch_threshold)
+    reference_rate = len(landmarks) / (time.perf_counter() - start)
+    batch = np.column_stack([HandTracker.fingers_extended_batch(landmarks, args.beta),
+                             HandTracker.tweezers_batch(landmarks, args.pinch_threshold)])
+    mismatches = int((batch != reference).sum())
+
+    # batch implementation over all hands, accumulating the threshold sweeps
+    finger_correct = np.zeros((len(betas), len(FINGERS)))
+    pinch_counts = np.zeros((len(pinch_thresholds), 3))  # true positives, predicted, labelled
+    pinch_correct = np.zeros(len(pinch_thresholds))
+    generation_time = batch_time = 0.0
+    generated = 0
+    while generated < args.hands:
+        start = time.perf_counter()
+        hands = generator.sample(min(args.batch_size, args.hands - generated))
+        generation_time += time.perf_counter() - start
+        generated += len(hands.landmarks)
+
+        start = time.perf_counter()
+        HandTracker.fingers_extended_batch(hands.landmarks, args.beta)
+        HandTracker.tweezers_batch(hands.landmarks, args.pinch_threshold)
+        batch_time += time.perf_counter() - start
+
+        for i, beta in enumerate(betas):
+            predicted = HandTracker.fingers_extended_batch(hands.landmarks, beta)
+            finger_correct[i] += (predicted == hands.extended).sum(axis=0)
+        for i, threshold in enumerate(pinch_thresholds):
+            predicted = HandTracker.tweezers_batch(hands.landmarks, threshold)
+            pinch_counts[i] += [(predicted & hands.pinch).sum(), predicted.sum(), hands.pinch.sum()]
+            pinch_correct[i] += (predicted == hands.pinch).sum()
+
+    print(f"{'generator':>18} : {generated / generation_time:,.0f} hands/s")
+    print(f"{'per-hand methods':>18} : {reference_rate:,.0f} hands/s")
+    print(f"{'batch':>18} : {generated / batch_time:,.0f} hands/s")
+    print(f"{'mismatches':>18} : {mismatches} / {reference.size}")
+
+    print("\nFinger extension accuracy")
+    print(f"{'beta':>8} " + " ".join(f"{finger:>8}" for finger in FINGERS))
+    for beta, correct in zip(betas, finger_correct / generated):
+        print(f"{beta:>8.3f} " + " ".join(f"{value:>8.3f}" for value in correct))
+
+    print("\nTweezers")
+    print(f"{'threshold':>10} {'accuracy':>9} {'precision':>10} {'recall':>8}")
+    for threshold, correct, (tp, predicted, labelled) in zip(pinch_thresholds, pinch_correct / generated, pinch_counts):
+        precision = tp / predicted if predicted else float('nan')
+        recall = tp / labelled if labelled else float('nan')
+        print(f"{threshold:>10.3f} {correct:>9.3f} {precision:>10.3f} {recall:>8.3f}")
+
+    if mismatches:
+        print("FAIL - batch gesture functions disagree with the per-hand methods")
+        return 1
+    return 0
+
+def run_finger_states(args: argparse.Namespace) -> int:
+    """
+    Compare the image-axis finger test (is_finger_extended) with the 3D joint
+    angle estimator (finger_states) on synthetic hands of growing rotation,
+    and time the joint angle estimator per hand and in batch.
+
+    The ground truth comes from the generator's joint model, so the accuracy
+    shows the orientation invariance - it does not validate FLEXION_THRESHOLDS
+    on real MediaPipe landmarks.
+    """
+    from hand_tracker import HandTracker
+    from synthetic_hands import FINGERS, HandPoseGenerator
+
+    print(f"{'rotation':>8} {'method':>12} " + " ".join(f"{finger:>8}" for finger in FINGERS))
+    for rotation in args.rotations:
+        generator = HandPoseGenerator(seed=args.seed, max_roll=rotation, max_pitch=min(rotation, 60.0),
+                                      max_yaw=rotation, noise=args.noise, occlusion_rate=args.occlusion_rate)
+        hands = generator.sample(args.hands)
+        axis = HandTracker.fingers_extended_batch(hands.landmarks, args.beta)
+        angles = HandTracker.finger_states_batch(hands.landmarks)
+        world = HandTracker.finger_states_batch(hands.world_landmarks)
+        for method, predicted in (('image axis', axis), ('joint angle', angles), ('world angle', world)):
+            accuracy = (predicted == hands.extended).mean(axis=0)
+            print(f"{rotation:>8.0f} {method:>12} " + " ".join(f"{value:>8.3f}" for value in accuracy))
+
+    # the per-frame path (preallocated buffers) must match the batch implementation
+    tracker = HandTracker(model_path=None)
+    mismatches = 0
+    for landmarks, expected in zip(hands.landmarks[:args.reference_hands], angles):
+        tracker.set_landmarks(landmarks.astype(np.float64))
+        tracker.update_knuckles_coordinates(0.0, verbose=False)
+        mismatches += int((tracker.finger_states() != expected).any())
+    print(f"\n{'mismatches':>18} : {mismatches} / {min(args.reference_hands, len(angles))}")
+
+    # timing - one hand at a time (live loop) and the whole batch (recorded data)
+    tracker.set_landmarks(hands.landmarks[0].astype(np.float64))
+    tracker.update_knuckles_coordinates(0.0, verbose=False)
+    repeats = 20_000
+    start = time.perf_counter()
+    for _ in range(repeats):
+        tracker.finger_states()
+    single = (time.perf_counter() - start) / repeats
+    start = time.perf_counter()
+    HandTracker.finger_states_batch(hands.landmarks)
+    batch = (time.perf_counter() - start) / len(hands.landmarks)
+    print(f"{'single hand':>18} : {single * 1e6:.2f} us/hand")
+    print(f"{'batch':>18} : {batch * 1e6:.3f} us/hand")
+    return 1 if mismatches else 0
+
+def run_extraction(args: argparse.Namespace) -> int:
+    """
+    Frames per second of the offline landmark extraction for each worker count.
+    """
+    import tempfile
+    from extract_landmarks import extract
+
+    print(f"{'workers':>8} {'frames':>8} {'fps':>8} {'speedup':>8}")
+    baseline = None
+    for workers in args.workers:
+        with tempfile.TemporaryDirectory() as output_dir:
+            stats = extract(args.videos, output_dir, workers, args.segment_frames, args.stride,
+                            resume=False, verbose=False, model_path=args.model)
+        baseline = baseline or stats['fps']
+        print(f"{workers:>8} {stats['frames']:>8} {stats['fps']:>8.1f} {stats['fps'] / baseline:>8.2f}")
+    return 0
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Hand Controller benchmarks")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    allocations = subparsers.add_parser('allocations',
+                                        help="Steady-state allocations per frame of the mouse control loop")
+    allocations.add_argument('video', help="Recorded video replayed instead of the camera")
+    allocations.add_argument('--model', default="hand_landmarker.task")
+    allocations.add_argument('--max-frames', type=int, default=300)
+    allocations.add_argument('--warmup', type=int, default=30)
+    allocations.add_argument('--min-score', type=float, default=0.3)
+    allocations.add_argument('--max-transient-bytes', type=float, default=4096.0)
+    allocations.add_argument('--max-objects-per-frame', type=float, default=1.0)
+    allocations.set_defaults(func=run_allocations)
+
+    allocations_check = subparsers.add_parser('allocations-check',
+                                              help="Check the allocation gate on synthetic frames (no camera or model)")
+    allocations_check.add_argument('--frames', type=int, default=200)
+    allocations_check.add_argument('--warmup', type=int, default=30)
+    allocations_check.add_argument('--max-transient-bytes', type=float, default=4096.0)
+    allocations_check.add_argument('--max-objects-per-frame', type=float, default=1.0)
+    allocations_check.set_defaults(func=run_allocations_check)
+
+    gestures = subparsers.add_parser('gestures',
+                                     help="Throughput and accuracy of the gesture functions on synthetic hands")
+    gestures.add_argument('--hands', type=int, default=1_000_000)
+    gestures.add_argument('--batch-size', type=int, default=100_000)
+    gestures.add_argument('--reference-hands', type=int, default=10_000)
+    gestures.add_argument('--seed', type=int, default=0)
+    gestures.add_argument('--beta', type=float, default=0.22)
+    gestures.add_argument('--pinch-threshold', type=float, default=0.04)
+    gestures.add_argument('--betas', type=parse_floats, default=[0.0, 0.05, 0.1, 0.15, 0.2, 0.22, 0.25, 0.3])
+    gestures.add_argument('--pinch-thresholds', type=parse_floats, default=[0.02, 0.03, 0.04, 0.05, 0.06])
+    gestures.add_argument('--max-roll', type=float, default=30.0)
+    gestures.add_argument('--max-pitch', type=float, default=30.0)
+    gestures.add_argument('--max-yaw', type=float, default=30.0)
+    gestures.add_argument('--left-hand-rate', type=float, default=0.5)
+    gestures.add_argument('--noise', type=float, default=0.003)
+    gestures.add_argument('--occlusion-rate', type=float, default=0.0)
+    gestures.set_defaults(func=run_gestures)
+
+    finger_states = subparsers.add_parser('finger-states',
+                                          help="Orientation invariance and speed of the 3D finger state estimator")
+    finger_states.add_argument('--hands', type=int, default=200_000)
+    finger_states.add_argument('--seed', type=int, default=0)
+    finger_states.add_argument('--beta', type=float, default=0.05)
+    finger_states.add_argument('--rotations', type=parse_floats, default=[0.0, 30.0, 90.0, 180.0])
+    finger_states.add_argument('--noise', type=float, default=0.003)
+    finger_states.add_argument('--occlusion-rate', type=float, default=0.0)
+    finger_states.add_argument('--reference-hands', type=int, default=5_000)
+    finger_states.set_defaults(func=run_finger_states)
+
+    extraction = subparsers.add_parser('extraction',
+                                       help="Offline landmark extraction fps scaling by worker count")
+    extraction.add_argument('videos', nargs='+', help="Recorded videos")
+    extraction.add_argument('--model', default="hand_landmarker.task")
+    extraction.add_argument('--workers', type=parse_ints, default=[1, 2, 4])
+    extraction.add_argument('--segment-frames', type=int, default=300)
+    extraction.add_argument('--stride', type=int, default=1)
+    extraction.set_defaults(func=run_extraction)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,6 @@
 import cv2 as cv
 import numpy as np
-from typing import Tuple
+from typing import Tuple, Union
 
 class Camera:
     """
@@ -8,27 +8,31 @@ class Camera:
     basic frame preprocessing.
 
     Responsibilities:
-    - Initialize and manage the camera device
+    - Initialize and manage the camera device (or a recorded video file standing in for it)
     - Read frames from the camera
     - Apply optional image preprocessing filters
     """
 
-    def __init__(self, camera_id: int = 0):
+    def __init__(self, camera_id: Union[int, str] = 0):
         """
         Initialize the camera capture device.
         
         Args:
-            camera_id (int): Index of the camera device.
+            camera_id (int | str): Index of the camera device or path to a video file.
                              Default is 0 (usually the primary camera)
         """
 
         self.cap = cv.VideoCapture(camera_id)
-        # Camera properties - set to HD
-        self.cap.set(cv.CAP_PROP_FRAME_WIDTH, 1280)
-        self.cap.set(cv.CAP_PROP_FRAME_HEIGHT, 720)
+        self.is_file = isinstance(camera_id, str)
+        if not self.is_file:
+            # Camera properties - set to HD
+            self.cap.set(cv.CAP_PROP_FRAME_WIDTH, 1280)
+            self.cap.set(cv.CAP_PROP_FRAME_HEIGHT, 720)
         # Ensure the camera was successfully opened
         if not self.cap.isOpened():
             raise RuntimeError("Could not open camera")
+        # Frame rate reported by the device or the file (0 if unknown)
+        self.fps = self.cap.get(cv.CAP_PROP_FPS)
         
     def read(self) -> Tuple[bool, np.ndarray]:
         """
@@ -1,6 +1,8 @@
+import math
+import time
+import threading
 import pyautogui
-import numpy as np
-from typing import Tuple
+from typing import Dict, Tuple
 
 class ComputerInputController:
     """
@@ -10,11 +12,17 @@ class ComputerInputController:
     - Low-latency keyboard press/release handling
     - Absolute mouse movement
     - Smoothed mouse movement using an EMA
+    - Optional cursor output stage that moves the cursor at display rate,
+      independently of the camera fps
 
     Typical use case:
         - Map hand gestures or tracking finger coordinates to OS-level inputs.
     """
 
+    # Every pyautogui call goes through this lock: on X11 pyautogui shares one python-xlib
+    # Display, which isn't thread-safe, and the cursor output stage runs on its own thread
+    _pyautogui_lock = threading.Lock()
+
     def __init__(self, alpha:float=0.2):
         """
         Init the input controller.
@@ -34,15 +42,20 @@ class ComputerInputController:
         pyautogui.PAUSE = 0 
         # Screen resolution
         self.screen_w, self.screen_h = pyautogui.size()
-        # Initial mouse position
-        self.prev_x, self.prev_y = pyautogui.position()
-        self.prev_x /= self.screen_w
-        self.prev_y /= self.screen_h
+        # Initial mouse position - EMA state in the mirrored space of the targets (screen x = 1 - x)
+        position_x, position_y = pyautogui.position()
+        self.prev_x = 1 - position_x / self.screen_w
+        self.prev_y = position_y / self.screen_h
         # EMA factor
         self.alpha = alpha
         # Scrolling cursor position
         self.scroll_x = None
         self.scroll_y = None
+        # Cursor output stage (see start_cursor_output)
+        self._output_thread = None
+        self._output_stop = threading.Event()
+        self._output_lock = threading.Lock()
+        self._reset_output_stats()
 
     @staticmethod
     def virtual_bounding_box_control(x: float, y: float, control_margin: float = 0.15) -> Tuple[float, float]:
@@ -64,13 +77,14 @@ class ComputerInputController:
             raise ValueError("Control margin must be in [0, 0.5)")
         # Vertical scaling factor to increase stability
         y_factor = 3 
-        # Clip to safe zone
-        x = np.clip(x, control_margin, 1 - control_margin)
-        y = np.clip(y, y_factor * control_margin, 1 - y_factor * control_margin)
+        y_margin = y_factor * control_margin
+        # Clip to safe zone (plain floats - np.clip would allocate NumPy scalars every frame)
+        x = min(max(x, control_margin), 1 - control_margin)
+        y = min(max(y, y_margin), 1 - y_margin)
 
         # Remap to full range 0 - 1 range
         x = (x - control_margin) / (1 - 2 * control_margin)
-        y = (y - y_factor * control_margin) / (1 - 2 * y_factor * control_margin)
+        y = (y - y_margin) / (1 - 2 * y_margin)
 
         return x, y
     
@@ -89,11 +103,47 @@ class ComputerInputController:
                         'space': True
                     }
         """
-        for key, status in commands.items():
-            if status:
-                pyautogui.keyDown(key)
-            else:
-                pyautogui.keyUp(key)
+        with ComputerInputController._pyautogui_lock:
+            for key, status in commands.items():
+                if status:
+                    pyautogui.keyDown(key)
+                else:
+                    pyautogui.keyUp(key)
+
+    def key_down(self, key: str) -> None:
+        """
+        Press and hold a keyboard key.
+        """
+        with self._pyautogui_lock:
+            pyautogui.keyDown(key)
+
+    def key_up(self, key: str) -> None:
+        """
+        Release a keyboard key.
+        """
+        with self._pyautogui_lock:
+            pyautogui.keyUp(key)
+
+    def mouse_down(self, button: str = 'left') -> None:
+        """
+        Press and hold a mouse button ('left', 'middle' or 'right').
+        """
+        with self._pyautogui_lock:
+            pyautogui.mouseDown(button=button)
+
+    def mouse_up(self, button: str = 'left') -> None:
+        """
+        Release a mouse button ('left', 'middle' or 'right').
+        """
+        with self._pyautogui_lock:
+            pyautogui.mouseUp(button=button)
+
+    def right_click(self) -> None:
+        """
+        Click the right mouse button.
+        """
+        with self._pyautogui_lock:
+            pyautogui.rightClick()
 
     def scroll(self, x: float, y: float, gamma : float = 100.0) -> None:
         """
@@ -112,12 +162,13 @@ class ComputerInputController:
         dx = x - self.scroll_x
         dy = y - self.scroll_y
 
-        if abs(dy) > abs(dx):
-            pyautogui.scroll(int(-dy * gamma))
-        else:
-            pyautogui.keyDown('shift')
-            pyautogui.scroll(int(-dx * gamma))
-            pyautogui.keyUp('shift')
+        with self._pyautogui_lock:
+            if abs(dy) > abs(dx):
+                pyautogui.scroll(int(-dy * gamma))
+            else:
+                pyautogui.keyDown('shift')
+                pyautogui.scroll(int(-dx * gamma))
+                pyautogui.keyUp('shift')
 
         self.scroll_x, self.scroll_y = x, y
 
@@ -133,7 +184,8 @@ class ComputerInputController:
         """
         x = int((1 - x) * self.screen_w)
         y = int(y * self.screen_h)
-        pyautogui.moveTo(x, y)
+        with self._pyautogui_lock:
+            pyautogui.moveTo(x, y)
 
     def smooth_move(self, x: float, y: float) -> None:
         """
@@ -146,6 +198,30 @@ class ComputerInputController:
             x (float): Normalized horizontal coordinate (0.0 - 1.0)
             y (float): Normalized vertical coordinate (0.0 - 1.0)
         """
+        x, y = self.smooth_target(x, y)
+
+        if self._output_thread is not None:
+            # the output stage moves the cursor - only update its target
+            self._set_cursor_target(x, y)
+            return
+
+        screen_w = int((1 - x) * self.screen_w)
+        screen_h = int(y * self.screen_h)
+
+        with self._pyautogui_lock:
+            pyautogui.moveTo(screen_w, screen_h)
+
+    def smooth_target(self, x: float, y: float) -> Tuple[float, float]:
+        """
+        Update the EMA cursor target without moving the cursor.
+
+        Args:
+            x (float): Normalized horizontal coordinate (0.0 - 1.0)
+            y (float): Normalized vertical coordinate (0.0 - 1.0)
+
+        Returns:
+            Tuple[float, float]: Smoothed normalized target (not mirrored).
+        """
         x, y = self.virtual_bounding_box_control(x, y)
 
         if self.prev_x is None:
@@ -155,8 +231,193 @@ class ComputerInputController:
         x = self.alpha * x + (1 - self.alpha) * self.prev_x 
         y = self.alpha * y + (1 - self.alpha) * self.prev_y
         self.prev_x, self.prev_y = x, y
+        return x, y
 
-        screen_w = int((1 - x) * self.screen_w)
-        screen_h = int(y * self.screen_h)
+    # ------------------------------------------------------------------
+    # Cursor output stage
+    # ------------------------------------------------------------------
+
+    def start_cursor_output(self, rate: float = 120.0, extrapolate: bool = False,
+                            max_extrapolation: float = 0.05, max_error: float = 0.02) -> None:
+        """
+        Start moving the cursor from a background thread at a fixed rate.
+
+        While it runs, smooth_move only updates the cursor target. Each new target
+        starts a segment from the current cursor position, which the output stage
+        walks over one camera frame interval (estimated from the target arrivals).
+        The cursor then moves at `rate` Hz whatever the camera/inference fps is.
+
+        Args:
+            rate (float): Cursor update rate in Hz (e.g. the display refresh rate).
+            extrapolate (bool): If True, keeps moving along the last segment when the
+                next target is late, instead of stopping at the target.
+            max_extrapolation (float): Maximum extrapolation time (seconds).
+            max_error (float): Maximum extrapolated distance beyond the latest target
+                (normalized units).
+        """
+        if rate <= 0:
+            raise ValueError("Cursor output rate must be positive.")
+        self.stop_cursor_output()
+        self.output_rate = rate
+        self.extrapolate = extrapolate
+        self.max_extrapolation = max_extrapolation
+        self.max_error = max_error
+        now = time.perf_counter()
+        # start from the actual cursor, in the mirrored space of the targets (screen x = 1 - x)
+        with self._pyautogui_lock:
+            position_x, position_y = pyautogui.position()
+        cursor = (1 - position_x / self.screen_w, position_y / self.screen_h)
+        # the EMA continues from the same point, so the first target doesn't sweep the cursor
+        self.prev_x, self.prev_y = cursor
+        # current segment: start -> target, started at _segment_time
+        self._segment_start = cursor
+        self._target = cursor
+        self._segment_time = now
+        self._frame_interval = 1 / 30
+        self._cursor = cursor
+        self._reset_output_stats()
+        self._output_stop.clear()
+        # pixel of the seeded cursor - nothing is sent to the OS until the first target moves it
+        cursor_px = (int((1 - cursor[0]) * self.screen_w), int(cursor[1] * self.screen_h))
+        self._output_thread = threading.Thread(target=self._cursor_output_loop,
+                                               args=(cursor_px,), daemon=True)
+        self._output_thread.start()
+
+    def stop_cursor_output(self) -> None:
+        """
+        Stop the cursor output stage (smooth_move moves the cursor directly again).
+        """
+        if self._output_thread is None:
+            return
+        self._output_stop.set()
+        self._output_thread.join()
+        self._output_thread = None
+        self._output_stats['stop'] = time.perf_counter()
+
+    def cursor_output_stats(self) -> Dict[str, float]:
+        """
+        Report how smooth the cursor output is.
 
-        pyautogui.moveTo(screen_w, screen_h)
\ No newline at end of file
+        Returns:
+            Dict[str, float]:
+                - rate: achieved cursor update rate (Hz)
+                - target_rate: rate of new targets from smooth_move (Hz)
+                - mean_step_px / max_step_px: cursor displacement per update
+                - rms_accel_px: RMS change of the displacement between updates (second difference)
+                - rms_jerk_px: RMS change of that acceleration (third difference, lower = smoother)
+                - mean_overshoot_px / max_overshoot_px: distance past the latest target
+                  along the segment direction. Interpolation stops at the target, so it is
+                  always 0 unless extrapolate=True.
+        """
+        with self._output_lock:
+            stats = dict(self._output_stats)
+        end = stats['stop'] if stats['stop'] is not None else time.perf_counter()
+        elapsed = max(end - stats['start'], 1e-9)
+        ticks = max(stats['ticks'], 1)
+        steps = max(stats['steps'], 1)
+        accels = max(stats['accels'], 1)
+        jerks = max(stats['jerks'], 1)
+        return {
+            'rate': stats['ticks'] / elapsed,
+            'target_rate': stats['targets'] / elapsed,
+            'mean_step_px': stats['step_sum'] / steps,
+            'max_step_px': stats['max_step'],
+            'rms_accel_px': math.sqrt(stats['accel_sum'] / accels),
+            'rms_jerk_px': math.sqrt(stats['jerk_sum'] / jerks),
+            'mean_overshoot_px': stats['overshoot_sum'] / ticks,
+            'max_overshoot_px': stats['max_overshoot'],
+        }
+
+    def _reset_output_stats(self) -> None:
+        self._output_stats = {
+            'start': time.perf_counter(), 'stop': None, 'ticks': 0, 'targets': 0,
+            'steps': 0, 'step_sum': 0.0, 'max_step': 0.0,
+            'accels': 0, 'accel_sum': 0.0, 'jerks': 0, 'jerk_sum': 0.0,
+            'overshoot_sum': 0.0, 'max_overshoot': 0.0,
+        }
+        self._last_step = None
+        self._last_accel = None
+
+    def _set_cursor_target(self, x: float, y: float) -> None:
+        """
+        Start a new segment from the current cursor position to (x, y).
+        """
+        now = time.perf_counter()
+        with self._output_lock:
+            # EMA of the time between targets = duration of the next segment
+            interval = min(now - self._segment_time, 0.25)
+            self._frame_interval += 0.2 * (interval - self._frame_interval)
+            self._segment_start = self._cursor
+            self._target = (x, y)
+            self._segment_time = now
+            self._output_stats['targets'] += 1
+
+    def _cursor_position(self, now: float) -> Tuple[float, float]:
+        """
+        Cursor position (normalized) at time `now` on the current segment.
+        """
+        (x0, y0), (x1, y1) = self._segment_start, self._target
+        progress = (now - self._segment_time) / self._frame_interval
+        if not self.extrapolate or progress <= 1:
+            progress = min(progress, 1.0)
+            return x0 + (x1 - x0) * progress, y0 + (y1 - y0) * progress
+
+        # extrapolation - bounded in time and in distance from the target
+        progress = min(progress, 1 + self.max_extrapolation / self._frame_interval)
+        dx, dy = (x1 - x0) * (progress - 1), (y1 - y0) * (progress - 1)
+        distance = math.hypot(dx, dy)
+        if distance > self.max_error:
+            dx *= self.max_error / distance
+            dy *= self.max_error / distance
+        return x1 + dx, y1 + dy
+
+    def _cursor_output_loop(self, last_px: Tuple[int, int]) -> None:
+        period = 1 / self.output_rate
+        next_tick = time.perf_counter()
+        while not self._output_stop.is_set():
+            now = time.perf_counter()
+            with self._output_lock:
+                x, y = self._cursor_position(now)
+                self._cursor = (x, y)
+                (x0, y0), (x1, y1) = self._segment_start, self._target
+                stats = self._output_stats
+                stats['ticks'] += 1
+
+                # overshoot: how far (pixels) the cursor is past the target along the segment
+                ux, uy = (x1 - x0) * self.screen_w, (y1 - y0) * self.screen_h
+                length = math.hypot(ux, uy)
+                if length > 0:
+                    past = ((x - x1) * self.screen_w * ux + (y - y1) * self.screen_h * uy) / length
+                    overshoot = max(past, 0.0)
+                    stats['overshoot_sum'] += overshoot
+                    stats['max_overshoot'] = max(stats['max_overshoot'], overshoot)
+
+                # differences of the cursor position per update: step, acceleration, jerk
+                px = (int((1 - x) * self.screen_w), int(y * self.screen_h))
+                step = (px[0] - last_px[0], px[1] - last_px[1])
+                stats['steps'] += 1
+                stats['step_sum'] += math.hypot(*step)
+                stats['max_step'] = max(stats['max_step'], math.hypot(*step))
+                if self._last_step is not None:
+                    accel = (step[0] - self._last_step[0], step[1] - self._last_step[1])
+                    stats['accels'] += 1
+                    stats['accel_sum'] += accel[0] ** 2 + accel[1] ** 2
+                    if self._last_accel is not None:
+                        stats['jerks'] += 1
+                        stats['jerk_sum'] += (accel[0] - self._last_accel[0]) ** 2 + (accel[1] - self._last_accel[1]) ** 2
+                    self._last_accel = accel
+                self._last_step = step
+
+            # only call the OS when the cursor actually moves
+            if px != last_px:
+                with self._pyautogui_lock:
+                    pyautogui.moveTo(*px)
+                last_px = px
+
+            next_tick += period
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                self._output_stop.wait(delay)
+            else:
+                # running late - don't try to catch up with a burst of moves
+                next_tick = time.perf_counter()
\ No newline at end of file
@@ -0,0 +1,278 @@
+import os
+import sys
+import json
+import time
+import argparse
+import itertools
+import cv2 as cv
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+from hand_tracker import HandTracker
+
+# One record per processed frame - chunks are plain .npy files, so np.load(mmap_mode='r') works
+# handedness: 1 = right, 0 = left, -1 = no hand (landmarks are NaN)
+LANDMARK_DTYPE = np.dtype([
+    ('frame', np.int64),
+    ('landmarks', np.float32, (21, 3)),
+    ('score', np.float32),
+    ('handedness', np.int8),
+])
+
+class Segment(NamedTuple):
+    """
+    A range of frames of one video, processed by one worker task.
+
+    - video: path of the video file
+    - start / end: frame range [start, end) - end None reads until the end of the video
+    - stride: process one frame every `stride` frames
+    - output: path of the chunk written for this segment
+    """
+    video: str
+    start: int
+    end: Optional[int]
+    stride: int
+    output: str
+
+# Landmarker of the current worker process (one instance per worker), its options
+# and the (video, end frame) of the last segment it processed
+_tracker: Optional[HandTracker] = None
+_tracker_options: dict = {}
+_last_segment: Optional[Tuple[str, int]] = None
+
+def _init_worker(tracker_options: dict) -> None:
+    global _tracker, _tracker_options
+    _tracker_options = tracker_options
+    _tracker = HandTracker(**tracker_options)
+
+def _segment_tracker(segment: Segment) -> HandTracker:
+    """
+    Landmarker of the worker, ready for `segment`.
+
+    In video mode the landmarker tracks the hand from the previous frame, so it is
+    only reused when the segment continues the last one of the same video -
+    otherwise a fresh landmarker is created to drop the tracking state.
+    """
+    global _tracker, _last_segment
+    if _tracker.mode == 'video' and _last_segment is not None and _last_segment != (segment.video, segment.start):
+        _tracker.close()
+        _tracker = HandTracker(**_tracker_options)
+    _last_segment = (segment.video, segment.end)
+    return _tracker
+
+def _open_at(video: str, start: int) -> cv.VideoCapture:
+    """
+    Open a video positioned on frame `start`.
+
+    Seeking with CAP_PROP_POS_FRAMES isn't frame-accurate with every codec or
+    container. If the reported position is wrong, the video is opened again and
+    read forward to the start frame.
+    """
+    cap = cv.VideoCapture(video)
+    if not cap.isOpened():
+        raise RuntimeError(f"Could not open video {video}")
+    if start == 0:
+        return cap
+    cap.set(cv.CAP_PROP_POS_FRAMES, start)
+    if int(cap.get(cv.CAP_PROP_POS_FRAMES)) == start:
+        return cap
+    cap.release()
+    cap = cv.VideoCapture(video)
+    for _ in range(start):
+        if not cap.grab():
+            break
+    return cap
+
+def _empty_records(n: int) -> np.ndarray:
+    records = np.zeros(n, dtype=LANDMARK_DTYPE)
+    records['landmarks'] = np.nan
+    records['handedness'] = -1
+    return records
+
+def _extract_segment(segment: Segment) -> Tuple[str, int, float]:
+    """
+    Stream the frames of a segment through the worker's landmarker and write its chunk.
+
+    The chunk is written to a temporary file and renamed when complete, so an
+    interrupted run never leaves a partial chunk behind.
+
+    Returns:
+        Tuple[str, int, float]: chunk path, processed frames and processing time (seconds).
+    """
+    start_time = time.perf_counter()
+    end = segment.end
+    records = _empty_records(len(range(segment.start, end, segment.stride)) if end is not None else 1024)
+
+    tracker = _segment_tracker(segment)
+    cap = _open_at(segment.video, segment.start)
+    count = 0
+    for index in range(segment.start, end) if end is not None else itertools.count(segment.start):
+        if (index - segment.start) % segment.stride:
+            # skipped frame - grab() still decodes it (FFmpeg), but skips the retrieval and conversion
+            if not cap.grab():
+                break
+            continue
+        ret, frame = cap.read()
+        if not ret:
+            break
+        if count == len(records):
+            # open-ended segment - grow the records
+            records = np.concatenate([records, _empty_records(len(records))])
+        results = tracker.get_results(frame)
+        records['frame'][count] = index
+        if results.hand_landmarks:
+            records['landmarks'][count] = [(lm.x, lm.y, lm.z) for lm in results.hand_landmarks[0]]
+            records['score'][count] = results.handedness[0][0].score
+            records['handedness'][count] = int(results.handedness[0][0].category_name == 'Right')
+        count += 1
+    cap.release()
+
+    temporary = segment.output + '.tmp.npy'
+    np.save(temporary, records[:count])
+    os.replace(temporary, segment.output)
+    return segment.output, count, time.perf_counter() - start_time
+
+def plan_segments(videos: Sequence[str], output_dir: str, segment_frames: int = 3000,
+                  stride: int = 1, settings: Optional[dict] = None) -> List[Segment]:
+    """
+    Split videos into segments and write the metadata of each video.
+
+    Each video gets a directory in `output_dir` (named after the file) with a
+    meta.json and one chunk per segment, named after its first frame. A directory
+    extracted with other settings is rejected, so chunks are never mixed.
+
+    Args:
+        videos (Sequence[str]): Video file paths.
+        output_dir (str): Output directory.
+        segment_frames (int): Frames per segment (0 = whole video in one segment).
+        stride (int): Process one frame every `stride` frames.
+        settings (dict): Other extraction settings recorded in meta.json
+            (landmarker mode, model, number of hands, ...).
+
+    Returns:
+        List[Segment]: Every segment of every video.
+    """
+    segments = []
+    for video in videos:
+        cap = cv.VideoCapture(video)
+        if not cap.isOpened():
+            raise RuntimeError(f"Could not open video {video}")
+        frame_count = int(cap.get(cv.CAP_PROP_FRAME_COUNT))
+        fps = cap.get(cv.CAP_PROP_FPS)
+        cap.release()
+
+        video_dir = os.path.join(output_dir, os.path.splitext(os.path.basename(video))[0])
+        os.makedirs(video_dir, exist_ok=True)
+        meta = {'video': os.path.abspath(video), 'fps': fps, 'frame_count': frame_count,
+                'stride': stride, 'segment_frames': segment_frames, **(settings or {})}
+        meta_path = os.path.join(video_dir, 'meta.json')
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                if json.load(f) != meta:
+                    raise ValueError(f"{video_dir} was extracted with other settings - use another output directory.")
+        with open(meta_path, 'w') as f:
+            json.dump(meta, f, indent=2)
+
+        if frame_count <= 0:
+            print(f"WARNING - {video} doesn't report its frame count - processed as a single segment")
+        step = segment_frames if segment_frames > 0 else max(frame_count, 1)
+        # segments start on a processed frame, so the stride is kept across segments
+        step = -(-step // stride) * stride
+        starts = list(range(0, frame_count, step)) or [0]
+        for start in starts:
+            output = os.path.join(video_dir, f"{start:010d}.npy")
+            # the frame count may be an estimate - the last segment reads until the video ends
+            end = start + step if start != starts[-1] else None
+            segments.append(Segment(video, start, end, stride, output))
+    return segments
+
+def extract(videos: Sequence[str], output_dir: str, workers: int = os.cpu_count() or 1,
+            segment_frames: int = 3000, stride: int = 1, mode: str = 'auto',
+            resume: bool = True, verbose: bool = True, **tracker_options) -> Dict[str, float]:
+    """
+    Extract hand landmarks from videos with a process pool.
+
+    Args:
+        videos (Sequence[str]): Video file paths.
+        output_dir (str): Output directory (see plan_segments).
+        workers (int): Number of worker processes, each with its own landmarker.
+        segment_frames (int): Frames per segment (0 = whole video in one segment).
+        stride (int): Process one frame every `stride` frames.
+        mode (str): 'video' (tracking across consecutive frames, restarted at every
+            segment that doesn't continue the worker's previous one), 'image'
+            (independent frames) or 'auto' - video when stride is 1, image otherwise.
+        resume (bool): Skip segments whose chunk already exists.
+        verbose (bool): Print the progress.
+        tracker_options: Keyword arguments of HandTracker (model_path, num_hands, ...).
+
+    Returns:
+        Dict[str, float]: processed frames, elapsed time and frames per second.
+    """
+    if mode == 'auto':
+        mode = 'video' if stride == 1 else 'image'
+    if mode not in ('video', 'image'):
+        raise ValueError("Mode not available. The options are: auto, video and image.")
+    tracker_options['mode'] = mode
+    settings = dict(tracker_options)
+    if settings.get('model_path') is not None:
+        settings['model_path'] = os.path.abspath(settings['model_path'])
+
+    segments = plan_segments(videos, output_dir, segment_frames, stride, settings)
+    pending = [segment for segment in segments if not (resume and os.path.exists(segment.output))]
+    if verbose:
+        print(f"{len(segments)} segments - {len(segments) - len(pending)} already done")
+
+    frames = 0
+    start_time = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(tracker_options,)) as executor:
+        futures = [executor.submit(_extract_segment, segment) for segment in pending]
+        for done, future in enumerate(as_completed(futures), 1):
+            output, count, seconds = future.result()
+            frames += count
+            if verbose:
+                print(f"[{done}/{len(pending)}] {output} - {count} frames - {count / seconds:.1f} fps")
+    elapsed = time.perf_counter() - start_time
+    return {'frames': frames, 'seconds': elapsed, 'fps': frames / elapsed if elapsed > 0 else 0.0}
+
+def iter_chunks(video_dir: str) -> Iterator[np.ndarray]:
+    """
+    Memory-map the chunks of one video in frame order.
+
+    Args:
+        video_dir (str): Directory of the video inside the output directory.
+
+    Yields:
+        np.ndarray: Read-only memory-mapped records (LANDMARK_DTYPE).
+    """
+    for name in sorted(os.listdir(video_dir)):
+        if name.endswith('.npy') and not name.endswith('.tmp.npy'):
+            yield np.load(os.path.join(video_dir, name), mmap_mode='r')
+
+def load_landmarks(video_dir: str) -> np.ndarray:
+    """
+    Load every chunk of one video into a single array of records (LANDMARK_DTYPE).
+    """
+    chunks = list(iter_chunks(video_dir))
+    return np.concatenate(chunks) if chunks else np.zeros(0, dtype=LANDMARK_DTYPE)
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Extract hand landmarks from recorded videos")
+    parser.add_argument('videos', nargs='+', help="Video files")
+    parser.add_argument('--output', required=True, help="Output directory")
+    parser.add_argument('--model', default="hand_landmarker.task")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--segment-frames', type=int, default=3000)
+    parser.add_argument('--stride', type=int, default=1)
+    parser.add_argument('--mode', choices=('auto', 'video', 'image'), default='auto')
+    parser.add_argument('--num-hands', type=int, default=1)
+    parser.add_argument('--no-resume', action='store_true', help="Process again existing chunks")
+    args = parser.parse_args()
+
+    stats = extract(args.videos, args.output, args.workers, args.segment_frames, args.stride,
+                    args.mode, not args.no_resume, model_path=args.model, num_hands=args.num_hands)
+    print(f"{stats['frames']} frames in {stats['seconds']:.1f} s - {stats['fps']:.1f} fps")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
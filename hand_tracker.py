@@ -1,5 +1,6 @@
 import time
 import math
+import array
 import cv2 as cv
 import numpy as np
 import mediapipe as mp
@@ -7,13 +8,15 @@ from typing import Optional, Tuple, List
 from mediapipe.tasks import python
 from mediapipe import Image, ImageFormat
 from mediapipe.tasks.python import vision
+from mediapipe.tasks.python.components.containers.category import Category
+from mediapipe.tasks.python.components.containers.landmark import NormalizedLandmark
 
 class HandTracker:
     """
     Hand tracking and gesture analysis using MediaPipe Hand Landmarker.
 
     Responsibilities:
-    - Run MediaPipe hand landmark detection (live stream or video mode)
+    - Run MediaPipe hand landmark detection (live stream, video or image mode)
     - Track hand landmark coordinates
     - Provide gesture-level utilities (finger extended, tweezers gesture)
     - Draw hand landmarks for visualization
@@ -38,10 +41,23 @@ class HandTracker:
         'ring': (13, 16),
         'pinky': (17, 20)
     }
+    # Bones as a difference matrix over the 21 landmarks - four bones per finger, starting at the wrist
+    # (bone = landmarks[child] - landmarks[parent], children are the landmarks 1..20)
+    _BONE_PARENTS = [0, 1, 2, 3, 0, 5, 6, 7, 0, 9, 10, 11, 0, 13, 14, 15, 0, 17, 18, 19]
+    _BONES = np.eye(21)[1:] - np.eye(21)[_BONE_PARENTS]
+    # Flattened positions in the 20x20 bone Gram matrix of (bone_in . bone_out, |bone_in|^2, |bone_out|^2)
+    # for the 15 joints (3 per finger, bone k -> bone k+1 of the same finger)
+    _JOINT_IN = np.array([4 * finger + joint for finger in range(5) for joint in range(3)])
+    _GRAM_INDEX = np.stack([_JOINT_IN * 20 + _JOINT_IN + 1, _JOINT_IN * 21, (_JOINT_IN + 1) * 21])
+    # Maximum total flexion (radians, sum of the 3 joints) of an extended finger - FINGER_INDEX order
+    # Tuned on synthetic_hands.py (benchmark.py finger-states), i.e. against the generator's own
+    # joint model - not validated on real MediaPipe landmarks yet, the thumb threshold in particular
+    FLEXION_THRESHOLDS = np.radians([60.0, 80.0, 80.0, 80.0, 80.0])
     # Store the most recent hand landmark coordinates (normalized)
+    # One [x, y, z] list per landmark, updated in place on every frame
     HAND_KNUCKLES_COORDINATES = []
 
-    def __init__(self, model_path:str="hand_landmarker.task", 
+    def __init__(self, model_path:Optional[str]="hand_landmarker.task", 
                  mode:str="live_stream", 
                  num_hands:int=1,
                  min_hand_detection_confidence:float=0.2,
@@ -53,7 +69,9 @@ class HandTracker:
 
         Args:
             model_path (str): Path to the MediaPipe hand landmarker model (hand_landmarker.task).
-            mode (str): 'live_stream' or 'video'.
+                None skips loading the model - landmarks are then fed with set_landmarks
+                (recorded or synthetic data).
+            mode (str): 'live_stream', 'video' or 'image' (independent frames, no tracking).
             num_hands (int): Maximum number of hands to detect.
             min_hand_detection_confidence (float): Detection confidence threshold.
             min_hand_presence_confidence (float): Presence confidence threshold.
@@ -80,10 +98,17 @@ class HandTracker:
                                                     min_hand_presence_confidence=min_hand_presence_confidence,
                                                     min_tracking_confidence=min_tracking_confidence
                                                     )
+        elif self.mode == "image":
+            options = vision.HandLandmarkerOptions(base_options=base_options,
+                                                   running_mode=vision.RunningMode.IMAGE,
+                                                   num_hands=num_hands,
+                                                   min_hand_detection_confidence=min_hand_detection_confidence,
+                                                   min_hand_presence_confidence=min_hand_presence_confidence
+                                                   )
         else:
-            raise ValueError("Mode not available. The options are: live_stream and video.")
+            raise ValueError("Mode not available. The options are: live_stream, video and image.")
 
-        self.detector = vision.HandLandmarker.create_from_options(options) 
+        self.detector = vision.HandLandmarker.create_from_options(options) if model_path is not None else None
 
         # visualization utilities
         self.mp_hands = mp.tasks.vision.HandLandmarksConnections
@@ -94,6 +119,24 @@ class HandTracker:
         self.results = vision.HandLandmarkerResult
         # monotonically increasing timestamp (required by MediaPipe)
         self._timestamp_ms = 0
+        # reusable RGB buffer - avoids allocating a new frame on every call
+        self._rgb_frame = None
+        # frame width / height - normalized x and z are scaled by it for the 3D joint angles
+        # (set from the processed frames, or by the caller when landmarks come from set_landmarks)
+        self.aspect_ratio = 1.0
+
+        # float copy of HAND_KNUCKLES_COORDINATES, filled in place by update_knuckles_coordinates:
+        # the array is a flat (63,) view of a buffer whose items are much cheaper to set than numpy items
+        self._coordinates_buffer = array.array('d', bytes(8 * 21 * 3))
+        self._coordinates = np.frombuffer(self._coordinates_buffer)
+        # preallocated buffers of finger_states - the bone matrix (flat landmarks -> flat bones,
+        # aspect ratio included) is rebuilt only when the aspect ratio changes
+        self._bone_matrix = None
+        self._bone_matrix_aspect_ratio = None
+        self._bones = np.empty(20 * 3)
+        self._gram = np.empty((20, 20))
+        self._gram_values = np.empty((3, 15))
+        self._bone_norms = np.empty(15)
 
     # ------------------------------------------------------------------
     # Utility functions
@@ -117,12 +160,23 @@ class HandTracker:
     # Detection interface
     # ------------------------------------------------------------------
 
+    def _to_rgb(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Convert a BGR frame to RGB into a reusable buffer (no allocation once warmed up).
+        """
+        if self._rgb_frame is None or self._rgb_frame.shape != frame.shape:
+            self._rgb_frame = np.empty_like(frame)
+            self.aspect_ratio = frame.shape[1] / frame.shape[0]
+        # convert in place - MediaPipe copies the pixels into its own Image
+        cv.cvtColor(frame, cv.COLOR_BGR2RGB, dst=self._rgb_frame)
+        return self._rgb_frame
+
     def get_results(self, frame: np.ndarray) -> vision.HandLandmarkerResult:
         """
         Run hand landmark detection on a frame.
 
         In live_stream mode, detection is asynchronous.
-        In video mode, detection is synchronous.
+        In video and image mode, detection is synchronous.
 
         Args:
             frame (np.ndarray): Input BGR image.
@@ -130,10 +184,11 @@ class HandTracker:
         Returns:
             vision.HandLandmarkerResult: Latest detection result.
         """
-        rgb_frame = cv.cvtColor(frame, cv.COLOR_BGR2RGB)
+        if self.detector is None:
+            raise RuntimeError("No model loaded - use set_landmarks to feed landmarks.")
         mp_image = Image(
             image_format=ImageFormat.SRGB,
-            data=rgb_frame
+            data=self._to_rgb(frame)
         )
         self._timestamp_ms += 1
         if self.mode == 'live_stream':
@@ -142,9 +197,42 @@ class HandTracker:
                 timestamp_ms=self._timestamp_ms
             )
             return self.results
+        elif self.mode == 'image':
+            self.results = self.detector.detect(mp_image)
+            return self.results
         else:
             self.results = self.detector.detect_for_video(mp_image, self._timestamp_ms)
             return self.results
+
+    def set_landmarks(self, landmarks: Optional[np.ndarray], handedness: str = 'Right', score: float = 1.0) -> vision.HandLandmarkerResult:
+        """
+        Use externally produced landmarks (recorded or synthetic) as the latest result.
+
+        The gesture functions then run exactly as they do on detector output.
+
+        Args:
+            landmarks (np.ndarray): Normalized landmarks of one hand, shape (21, 3).
+                None means no hand detected.
+            handedness (str): 'Right' or 'Left'.
+            score (float): Handedness confidence.
+
+        Returns:
+            vision.HandLandmarkerResult: The new latest result.
+        """
+        if landmarks is None:
+            self.results = vision.HandLandmarkerResult(handedness=[], hand_landmarks=[], hand_world_landmarks=[])
+            return self.results
+        hand_landmarks = [
+            NormalizedLandmark(x=float(x), y=float(y), z=float(z))
+            for x, y, z in landmarks
+            ]
+        category = Category(score=score, display_name=handedness, category_name=handedness)
+        self.results = vision.HandLandmarkerResult(
+            handedness=[[category]],
+            hand_landmarks=[hand_landmarks],
+            hand_world_landmarks=[]
+        )
+        return self.results
         
     # ------------------------------------------------------------------
     # Gesture detection
@@ -176,6 +264,7 @@ class HandTracker:
         return distance < threshold
 
     # TODO - this function works with the palm, but back of the hand doesn't work -> read this link https://github.com/google-ai-edge/mediapipe/blob/master/docs/solutions/hands.md
+    #        finger_states uses the 3D joint angles and works for any hand orientation
     def is_finger_extended(self, finger: str, beta: float = 0) -> bool:
         """
         Determine whether a specific finger is extended.
@@ -192,13 +281,14 @@ class HandTracker:
         Returns:
             bool: True if the finger is extended.
         """
-        finger = finger.lower()
         if len(self.HAND_KNUCKLES_COORDINATES ) < 21:
             print("Couldn't find the knuckles coordinates")
             return False
-        if finger not in self.FINGER_INDEX.keys():
-            print(f"Finger name unavailable - Possible names : {list(self.FINGER_INDEX.keys())}")
-            return False
+        if finger not in self.FINGER_INDEX:
+            finger = finger.lower()
+            if finger not in self.FINGER_INDEX:
+                print(f"Finger name unavailable - Possible names : {list(self.FINGER_INDEX.keys())}")
+                return False
         # for thumb we should use the X axis and for other fingers the Y axis
         if finger == 'thumb':
             axis = 0 # X
@@ -252,10 +342,20 @@ class HandTracker:
                     print(f"Hand {handedness} detected, but with not enough score --> {hand_score} / {target_score}")
                     return False
 
-                self.HAND_KNUCKLES_COORDINATES = [
-                    (landmark.x, landmark.y, landmark.z) 
-                    for landmark in hand_landmarks
-                    ]
+                coordinates = self.HAND_KNUCKLES_COORDINATES
+                if len(coordinates) != len(hand_landmarks):
+                    # first detection: allocate the buffer once and reuse it afterwards
+                    coordinates = [[0.0, 0.0, 0.0] for _ in hand_landmarks]
+                    self.HAND_KNUCKLES_COORDINATES = coordinates
+                # update in place to keep the frame loop allocation-free
+                buffer = self._coordinates_buffer
+                for i in range(len(hand_landmarks)):
+                    landmark = hand_landmarks[i]
+                    point = coordinates[i]
+                    j = 3 * i
+                    buffer[j] = point[0] = landmark.x
+                    buffer[j + 1] = point[1] = landmark.y
+                    buffer[j + 2] = point[2] = landmark.z
                 return True
 
         except AttributeError as e:
@@ -263,6 +363,167 @@ class HandTracker:
             return False
 
 
+    # ------------------------------------------------------------------
+    # Batch gesture detection (recorded or synthetic landmarks)
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def fingers_extended_batch(cls, landmarks: np.ndarray, beta: float = 0) -> np.ndarray:
+        """
+        Vectorized is_finger_extended for many hands at once.
+
+        Args:
+            landmarks (np.ndarray): Normalized landmarks, shape (n, 21, 3).
+            beta (float): linear value to create a threshold of finger extended.
+
+        Returns:
+            np.ndarray: Boolean array (n, 5), one column per finger in FINGER_INDEX order.
+        """
+        extended = np.empty(landmarks.shape[:-2] + (len(cls.FINGER_INDEX),), dtype=bool)
+        for i, (finger, (first, second)) in enumerate(cls.FINGER_INDEX.items()):
+            axis = 0 if finger == 'thumb' else 1
+            extended[..., i] = landmarks[..., second, axis] + beta < landmarks[..., first, axis]
+        return extended
+
+    @staticmethod
+    def tweezers_batch(landmarks: np.ndarray, threshold: float) -> np.ndarray:
+        """
+        Vectorized is_tweezers for many hands at once.
+
+        Args:
+            landmarks (np.ndarray): Normalized landmarks, shape (n, 21, 3).
+            threshold (float): Distance threshold for pinch detection.
+
+        Returns:
+            np.ndarray: Boolean array (n,).
+        """
+        distance = np.hypot(landmarks[..., 4, 0] - landmarks[..., 8, 0],
+                            landmarks[..., 4, 1] - landmarks[..., 8, 1])
+        return distance < threshold
+
+    # ------------------------------------------------------------------
+    # Orientation-invariant finger state (3D joint angles)
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def joint_angles(cls, landmarks: np.ndarray, aspect_ratio: float = 1.0) -> np.ndarray:
+        """
+        Compute the flexion angle of the 15 finger joints.
+
+        The angle of a joint is the angle between the bones before and after it
+        (0 = straight), so it doesn't depend on the hand orientation.
+        Works for one hand (21, 3) or a batch (..., 21, 3).
+
+        Args:
+            landmarks (np.ndarray): Normalized landmarks or world landmarks.
+            aspect_ratio (float): Frame width / height. Normalized landmarks are
+                scaled by it so x, y and z share the same unit (1.0 for world landmarks).
+
+        Returns:
+            np.ndarray: Angles in radians, shape (..., 5, 3) - FINGER_INDEX order,
+                joints from the palm to the tip. NaN next to a zero-length bone
+                (the finger is then classified as not extended).
+        """
+        points = np.asarray(landmarks, dtype=np.float64)
+        if aspect_ratio != 1.0:
+            points = points * (aspect_ratio, 1.0, aspect_ratio)
+        bones = cls._BONES @ points
+        # zero-length bones (repeated or collapsed landmarks) give NaN angles, without warnings
+        with np.errstate(invalid='ignore', divide='ignore'):
+            if bones.ndim == 2:
+                # single hand: one Gram matrix holds every dot product and squared length
+                dots = (bones @ bones.T).take(cls._GRAM_INDEX)
+                cosine = dots[0]
+                cosine /= np.sqrt(dots[1] * dots[2])
+            else:
+                bones = bones.reshape(bones.shape[:-2] + (5, 4, 3))
+                squared = np.einsum('...i,...i->...', bones, bones)
+                cosine = np.einsum('...i,...i->...', bones[..., :3, :], bones[..., 1:, :])
+                cosine /= np.sqrt(squared[..., :3] * squared[..., 1:])
+        # np.clip is much slower than minimum/maximum on small arrays
+        np.minimum(cosine, 1.0, out=cosine)
+        np.maximum(cosine, -1.0, out=cosine)
+        return np.arccos(cosine, out=cosine).reshape(points.shape[:-2] + (5, 3))
+
+    @classmethod
+    def fingers_extended_from_angles(cls, angles: np.ndarray, thresholds: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Classify fingers as extended from their joint angles.
+
+        Args:
+            angles (np.ndarray): Joint angles from joint_angles, shape (..., 5, 3).
+            thresholds (np.ndarray): Maximum total flexion (radians) per finger.
+                Default is FLEXION_THRESHOLDS.
+
+        Returns:
+            np.ndarray: Boolean array (..., 5) in FINGER_INDEX order.
+        """
+        if thresholds is None:
+            thresholds = cls.FLEXION_THRESHOLDS
+        return angles.sum(axis=-1) < thresholds
+
+    @classmethod
+    def finger_states_batch(cls, landmarks: np.ndarray, aspect_ratio: float = 1.0,
+                            thresholds: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Orientation-invariant extension state of every finger for recorded data.
+
+        Args:
+            landmarks (np.ndarray): Landmarks, shape (..., 21, 3).
+            aspect_ratio (float): Frame width / height (1.0 for world landmarks).
+            thresholds (np.ndarray): Maximum total flexion (radians) per finger.
+
+        Returns:
+            np.ndarray: Boolean array (..., 5) in FINGER_INDEX order.
+        """
+        return cls.fingers_extended_from_angles(cls.joint_angles(landmarks, aspect_ratio), thresholds)
+
+    def finger_states(self, world: bool = False, thresholds: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Orientation-invariant extension state of every finger of the first hand.
+
+        Unlike is_finger_extended, it also works for the back of the hand and
+        for rotated or tilted hands.
+
+        Args:
+            world (bool): Use the MediaPipe world landmarks (metric 3D) instead of
+                the normalized landmarks.
+            thresholds (np.ndarray): Maximum total flexion (radians) per finger.
+
+        Returns:
+            np.ndarray: Boolean array (5,) in FINGER_INDEX order (all False without landmarks).
+        """
+        if thresholds is None:
+            thresholds = self.FLEXION_THRESHOLDS
+        if world:
+            if not self.results or not self.results.hand_world_landmarks:
+                return np.zeros(len(self.FINGER_INDEX), dtype=bool)
+            landmarks = [(landmark.x, landmark.y, landmark.z) for landmark in self.results.hand_world_landmarks[0]]
+            return self.fingers_extended_from_angles(self.joint_angles(landmarks), thresholds)
+        if len(self.HAND_KNUCKLES_COORDINATES) < 21:
+            return np.zeros(len(self.FINGER_INDEX), dtype=bool)
+
+        # same computation as joint_angles, on the preallocated buffers (called on every frame)
+        if self._bone_matrix_aspect_ratio != self.aspect_ratio:
+            scale = np.diag([self.aspect_ratio, 1.0, self.aspect_ratio])
+            self._bone_matrix = np.kron(self._BONES, scale)
+            self._bone_matrix_aspect_ratio = self.aspect_ratio
+        bones = np.dot(self._bone_matrix, self._coordinates, out=self._bones).reshape(20, 3)
+        gram = np.dot(bones, bones.T, out=self._gram)
+        values = gram.take(self._GRAM_INDEX, out=self._gram_values)
+        cosine, norms = values[0], self._bone_norms
+        np.multiply(values[1], values[2], out=norms)
+        np.sqrt(norms, out=norms)
+        # a zero-length bone (repeated or collapsed landmarks) gives 0/0 = NaN, and a cosine
+        # below -1 (folded joint, rounding) gives NaN in arccos - no warning on every frame,
+        # a NaN angle sum compares False, so the finger is reported as not extended
+        with np.errstate(invalid='ignore', divide='ignore'):
+            np.divide(cosine, norms, out=cosine)
+            # rounding can push a straight joint above 1
+            np.minimum(cosine, 1.0, out=cosine)
+            np.arccos(cosine, out=cosine)
+        return cosine.reshape(5, 3).sum(axis=1) < thresholds
+
     # ------------------------------------------------------------------
     # Visualization
     # ------------------------------------------------------------------
@@ -356,4 +617,5 @@ class HandTracker:
         """
         Release MediaPipe resources.
         """
-        self.detector.close()
\ No newline at end of file
+        if self.detector is not None:
+            self.detector.close()
\ No newline at end of file
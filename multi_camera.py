@@ -0,0 +1,364 @@
+import sys
+import time
+import threading
+import numpy as np
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+from camera import Camera
+from hand_tracker import HandTracker
+
+class Observation(NamedTuple):
+    """
+    Latest hand detection of one camera.
+
+    - camera: camera index (position in the source list)
+    - timestamp: capture time in seconds (time.perf_counter clock)
+    - landmarks: normalized landmarks in the shared space, shape (21, 3) - None without hand
+    - score: handedness confidence from MediaPipe
+    - confidence: fusion weight (score reduced near the frame borders)
+    - handedness: 'Left' or 'Right'
+    - frame: captured BGR frame
+    """
+    camera: int
+    timestamp: float
+    landmarks: Optional[np.ndarray]
+    score: float
+    confidence: float
+    handedness: str
+    frame: np.ndarray
+
+class CameraWorker(threading.Thread):
+    """
+    Capture and hand tracking of one camera on its own thread.
+
+    MediaPipe releases the GIL during inference, so several workers run
+    their detections in parallel.
+    """
+
+    def __init__(self, index: int, source: Union[int, str], tracker_options: dict,
+                 calibration: Optional[np.ndarray], edge_margin: float,
+                 publish, realtime: bool = True):
+        """
+        Args:
+            index (int): Camera index (position in the source list).
+            source (int | str): Camera device index or video file path.
+            tracker_options (dict): Keyword arguments of HandTracker.
+            calibration (np.ndarray): 2x3 affine matrix from this camera's normalized
+                coordinates to the shared space (None = identity).
+            edge_margin (float): Distance to the frame border (normalized) below which
+                the confidence is reduced.
+            publish (Callable): Called with every new Observation.
+            realtime (bool): For video files, play at the file fps (like a device)
+                instead of as fast as possible.
+        """
+        super().__init__(daemon=True)
+        self.index = index
+        self.camera = Camera(source)
+        try:
+            self.detector = HandTracker(mode='video', **tracker_options)
+        except Exception:
+            self.camera.release()
+            raise
+        self.calibration = calibration
+        self.edge_margin = edge_margin
+        self.publish = publish
+        self.realtime = realtime
+        self.stop_event = threading.Event()
+        # statistics
+        self.frames = 0
+        self.detections = 0
+        self.latency = 0.0  # EMA in seconds
+        self.start_time = None
+        self.end_time = None
+
+    def to_shared_space(self, landmarks: np.ndarray) -> np.ndarray:
+        """
+        Map landmarks from this camera's normalized space to the shared space.
+        """
+        if self.calibration is None:
+            return landmarks
+        shared = np.empty_like(landmarks)
+        shared[:, :2] = landmarks[:, :2] @ self.calibration[:, :2].T + self.calibration[:, 2]
+        # depth follows the average scale of the affine transform
+        shared[:, 2] = landmarks[:, 2] * np.sqrt(abs(np.linalg.det(self.calibration[:, :2])))
+        return shared
+
+    def run(self) -> None:
+        self.start_time = time.perf_counter()
+        frame_period = 1 / self.camera.fps if self.camera.is_file and self.camera.fps > 0 else 0
+        try:
+            while not self.stop_event.is_set():
+                if frame_period and self.realtime:
+                    # pace the file like a live device
+                    delay = self.start_time + self.frames * frame_period - time.perf_counter()
+                    if delay > 0:
+                        self.stop_event.wait(delay)
+                ret, frame = self.camera.read()
+                timestamp = time.perf_counter()
+                if not ret:
+                    break
+                self.frames += 1
+                results = self.detector.get_results(frame)
+
+                landmarks, score, confidence, handedness = None, 0.0, 0.0, ''
+                if results.hand_landmarks:
+                    self.detections += 1
+                    landmarks = np.array([(lm.x, lm.y, lm.z) for lm in results.hand_landmarks[0]])
+                    score = results.handedness[0][0].score
+                    handedness = results.handedness[0][0].display_name
+                    # landmarks close to the frame borders are less reliable
+                    margin = min(landmarks[:, :2].min(), 1 - landmarks[:, :2].max())
+                    confidence = score * min(max(margin / self.edge_margin, 0.01), 1.0)
+                    landmarks = self.to_shared_space(landmarks)
+
+                self.latency += 0.1 * ((time.perf_counter() - timestamp) - self.latency)
+                self.publish(Observation(self.index, timestamp, landmarks, score, confidence, handedness, frame))
+        finally:
+            self.end_time = time.perf_counter()
+            self.camera.release()
+            self.detector.close()
+
+    def close(self) -> None:
+        """
+        Release the camera and the landmarker of a worker that was never started.
+        """
+        self.camera.release()
+        self.detector.close()
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Returns:
+            Dict[str, float]: fps, detection latency (ms) and detection rate of this camera.
+        """
+        end = self.end_time if self.end_time is not None else time.perf_counter()
+        elapsed = max(end - self.start_time, 1e-9) if self.start_time is not None else 1e-9
+        return {
+            'fps': self.frames / elapsed,
+            'latency_ms': self.latency * 1000,
+            'detection_rate': self.detections / self.frames if self.frames else 0.0,
+        }
+
+class MultiCameraTracker:
+    """
+    Run several Camera + HandTracker pairs in parallel and fuse their landmarks.
+
+    Each camera runs on its own CameraWorker thread. Once every running camera
+    has produced a new detection (cameras that fall behind are not waited for),
+    the latest observations of all cameras whose capture times are within
+    `max_skew` seconds are fused in the shared normalized space, either by
+    picking the most confident camera ('select') or by a confidence-weighted
+    average ('average') of the cameras that see the same hand.
+
+    Typical use case:
+        - Cover the borders of one camera's field of view with another one
+        - Keep tracking when the hand is occluded in one of the cameras
+    """
+
+    FUSION_METHODS = ('select', 'average')
+
+    def __init__(self, sources: Sequence[Union[int, str]],
+                 fusion: str = 'average',
+                 max_skew: float = 0.05,
+                 max_distance: float = 0.05,
+                 edge_margin: float = 0.05,
+                 calibrations: Optional[Sequence[Optional[np.ndarray]]] = None,
+                 realtime: bool = True,
+                 **tracker_options):
+        """
+        Args:
+            sources (Sequence[int | str]): Camera device indices or video file paths.
+            fusion (str): 'select' or 'average'.
+            max_skew (float): Maximum capture time difference (seconds) between fused observations.
+            max_distance (float): Maximum mean landmark distance (shared space) between
+                observations averaged together.
+            edge_margin (float): Distance to the frame border (normalized) below which
+                a camera's confidence is reduced.
+            calibrations (Sequence[np.ndarray]): One 2x3 affine matrix per camera from its
+                normalized coordinates to the shared space (None = identity).
+            realtime (bool): Play video files at their fps instead of as fast as possible.
+            tracker_options: Keyword arguments of HandTracker (model_path, min_*_confidence, ...).
+        """
+        if fusion not in self.FUSION_METHODS:
+            raise ValueError(f"Fusion method not available. The options are: {', '.join(self.FUSION_METHODS)}.")
+        if calibrations is not None and len(calibrations) != len(sources):
+            raise ValueError("One calibration per source must be provided.")
+        self.fusion = fusion
+        self.max_skew = max_skew
+        self.max_distance = max_distance
+        self.latest: List[Optional[Observation]] = [None] * len(sources)
+        # observations published by each camera, count at the last fusion, time of the
+        # last publish of each camera and of the first observation since the last fusion
+        self._published = [0] * len(sources)
+        self._fused = [0] * len(sources)
+        self._publish_time = [0.0] * len(sources)
+        self._pending_since = None
+        self._condition = threading.Condition()
+        tracker_options.setdefault('num_hands', 1)
+        self.workers = []
+        try:
+            for i, source in enumerate(sources):
+                self.workers.append(CameraWorker(i, source, tracker_options,
+                                                 None if calibrations is None else calibrations[i],
+                                                 edge_margin, self._publish, realtime))
+        except Exception:
+            # a source failed to open - release the devices and landmarkers already created
+            for worker in self.workers:
+                worker.close()
+            raise
+        for worker in self.workers:
+            worker.start()
+
+    def _publish(self, observation: Observation) -> None:
+        with self._condition:
+            self.latest[observation.camera] = observation
+            now = time.perf_counter()
+            self._published[observation.camera] += 1
+            self._publish_time[observation.camera] = now
+            if self._pending_since is None:
+                self._pending_since = now
+            self._condition.notify_all()
+
+    @staticmethod
+    def fuse(observations: Sequence[Observation], method: str = 'average',
+             max_skew: float = 0.05, max_distance: float = 0.05) -> Optional[Observation]:
+        """
+        Fuse the latest observations of several cameras.
+
+        Observations captured more than `max_skew` seconds before the newest one
+        are ignored (timestamp alignment), as well as cameras without a hand.
+        Only the observations that agree with the most confident one - same
+        handedness and landmarks within `max_distance` - are averaged, so two
+        cameras seeing different hands (or a miscalibrated camera) fall back to select.
+
+        Args:
+            observations (Sequence[Observation]): Latest observation of each camera.
+            method (str): 'select' (most confident camera) or 'average' (confidence-weighted).
+            max_skew (float): Maximum capture time difference (seconds).
+            max_distance (float): Maximum mean landmark distance (shared space) to the
+                most confident observation for an observation to be averaged.
+
+        Returns:
+            Observation: Fused observation (camera = most confident camera), or None without hand.
+        """
+        newest = max(observation.timestamp for observation in observations)
+        aligned = [
+            observation for observation in observations
+            if observation.landmarks is not None and newest - observation.timestamp <= max_skew
+        ]
+        if not aligned:
+            return None
+        best = max(aligned, key=lambda observation: observation.confidence)
+        if method == 'select' or len(aligned) == 1:
+            return best
+        aligned = [
+            observation for observation in aligned
+            if observation.handedness == best.handedness
+            and np.linalg.norm(observation.landmarks - best.landmarks, axis=1).mean() <= max_distance
+        ]
+        if len(aligned) == 1:
+            return best
+        weights = np.array([observation.confidence for observation in aligned])
+        landmarks = np.stack([observation.landmarks for observation in aligned])
+        fused = np.tensordot(weights / weights.sum(), landmarks, axes=1)
+        return best._replace(
+            timestamp=float(np.dot(weights, [observation.timestamp for observation in aligned]) / weights.sum()),
+            landmarks=fused,
+            score=max(observation.score for observation in aligned),
+            confidence=float(weights.max()),
+        )
+
+    def update(self, detector: HandTracker, timeout: float = 1.0) -> Tuple[bool, Optional[np.ndarray]]:
+        """
+        Wait for a new set of camera observations, fuse and feed the result to `detector`.
+
+        Replaces the Camera.read + HandTracker.get_results pair of the single camera loop.
+        Fuses once every running camera has published a new observation since the last
+        fusion, so the loop runs at the capture rate and not once per camera. Cameras
+        that haven't published for `max_skew` seconds (slower or stalled) aren't waited
+        for, and the fusion never waits more than `max_skew` after the first new observation.
+
+        Args:
+            detector (HandTracker): Tracker whose gesture functions consume the fused landmarks.
+                Its aspect_ratio is set from the frame of the fused camera.
+            timeout (float): Interval (seconds) to check whether the cameras stopped
+                while waiting for a new observation.
+
+        Returns:
+            Tuple[bool, np.ndarray]:
+                - success (bool): False once every camera stopped.
+                - frame (np.ndarray): Latest frame of the most confident camera.
+        """
+        with self._condition:
+            while True:
+                fresh = [count != last for count, last in zip(self._published, self._fused)]
+                if not any(fresh):
+                    if not self.running():
+                        return False, None
+                    # the timeout also checks for cameras that stopped
+                    self._condition.wait(timeout)
+                    continue
+                # wait only for the running cameras that keep up (published within max_skew)
+                now = time.perf_counter()
+                waiting = [
+                    not new and worker.is_alive() and now - published <= self.max_skew
+                    for new, worker, published in zip(fresh, self.workers, self._publish_time)
+                ]
+                if not any(waiting):
+                    break
+                remaining = self._pending_since + self.max_skew - now
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+            self._fused = list(self._published)
+            self._pending_since = None
+            observations = [observation for observation in self.latest if observation is not None]
+
+        fused = self.fuse(observations, self.fusion, self.max_skew, self.max_distance)
+        if fused is None:
+            detector.set_landmarks(None)
+            return True, max(observations, key=lambda observation: observation.timestamp).frame
+        # normalized landmarks are scaled by the frame aspect ratio in finger_states
+        height, width = fused.frame.shape[:2]
+        detector.aspect_ratio = width / height
+        detector.set_landmarks(fused.landmarks, fused.handedness, fused.score)
+        return True, fused.frame
+
+    def running(self) -> bool:
+        """
+        True while at least one camera is still capturing.
+        """
+        return any(worker.is_alive() for worker in self.workers)
+
+    def stats(self) -> List[Dict[str, float]]:
+        """
+        Per-camera fps, detection latency (ms) and detection rate.
+        """
+        return [worker.stats() for worker in self.workers]
+
+    def print_stats(self) -> None:
+        for i, stats in enumerate(self.stats()):
+            print(f"camera {i} : " + " | ".join(f"{name} {value:.2f}" for name, value in stats.items()))
+
+    def release(self) -> None:
+        """
+        Stop every camera worker and release the devices.
+        """
+        for worker in self.workers:
+            worker.stop_event.set()
+        for worker in self.workers:
+            worker.join()
+
+if __name__ == "__main__":
+    # Usage: python multi_camera.py <camera index or video file> [...]
+    sources = [int(arg) if arg.isdigit() else arg for arg in sys.argv[1:]] or [0]
+    tracker = MultiCameraTracker(sources)
+    fused_tracker = HandTracker(model_path=None)
+    fused_frames = 0
+    while True:
+        ret, frame = tracker.update(fused_tracker)
+        if not ret:
+            break
+        if fused_tracker.update_knuckles_coordinates(0.3, verbose=False):
+            fused_frames += 1
+    tracker.release()
+    tracker.print_stats()
+    print(f"fused frames with a hand : {fused_frames}")
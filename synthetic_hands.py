@@ -0,0 +1,288 @@
+import numpy as np
+from typing import Iterator, NamedTuple, Optional, Tuple
+
+# Finger order used by every array in this module (same order as HandTracker.FINGER_INDEX)
+FINGERS = ('thumb', 'index', 'middle', 'ring', 'pinky')
+
+class SyntheticHands(NamedTuple):
+    """
+    A batch of synthetic hands and their ground truth labels.
+
+    - landmarks (n, 21, 3): normalized image coordinates, like MediaPipe hand_landmarks
+    - world_landmarks (n, 21, 3): metric 3D coordinates around the hand center, like hand_world_landmarks
+    - angles (n, 5, 3): flexion angles (radians) of the three joints of each finger
+    - extended (n, 5): True if the finger was generated extended
+    - pinch (n,): True if thumb tip and index tip touch
+    - is_right (n,): True for right hands
+    - occluded (n, 21): True for landmarks hidden by the partial occlusion
+    """
+    landmarks: np.ndarray
+    world_landmarks: np.ndarray
+    angles: np.ndarray
+    extended: np.ndarray
+    pinch: np.ndarray
+    is_right: np.ndarray
+    occluded: np.ndarray
+
+class HandPoseGenerator:
+    """
+    Parametric generator of 21-landmark hands (MediaPipe layout).
+
+    Each finger is a chain of three segments bent by its joint flexion angles.
+    The canonical hand is a right hand with the palm facing the camera, measured
+    in palm units (wrist -> middle finger MCP = 1). Axes follow the image
+    convention: x to the right, y down and negative z towards the camera, so the
+    thumb of a right hand points towards +x (unmirrored camera image, the
+    convention of HandTracker.is_finger_extended). Left hands are its mirror image.
+
+    The canonical hand is then mirrored (handedness), rotated, scaled, moved
+    inside the frame and corrupted with noise and partial occlusion.
+    Everything is vectorized, so millions of hands can be produced in batches.
+
+    Typical use case:
+        - Fuzzing, accuracy sweeps and throughput tests of the gesture functions
+          without a camera or the MediaPipe model.
+    """
+
+    # Base joint of each finger chain (thumb CMC, index/middle/ring/pinky MCP)
+    BASES = np.array([
+        [0.25, -0.25, 0.0],
+        [0.30, -0.95, 0.0],
+        [0.05, -1.00, 0.0],
+        [-0.18, -0.93, 0.0],
+        [-0.38, -0.82, 0.0],
+    ])
+    # Segment lengths of each finger chain (proximal, middle, distal)
+    SEGMENTS = np.array([
+        [0.40, 0.32, 0.27],
+        [0.45, 0.27, 0.22],
+        [0.50, 0.30, 0.23],
+        [0.47, 0.29, 0.22],
+        [0.36, 0.22, 0.20],
+    ])
+    # Resting direction of each finger - angle (radians) from the -y axis towards +x (thumb side)
+    DIRECTIONS = np.array([0.9, 0.12, 0.0, -0.1, -0.22])
+    # Share of the bending that happens inside the palm plane (the thumb curls across the palm)
+    IN_PLANE_BEND = np.array([0.8, 0.0, 0.0, 0.0, 0.0])
+    # Joint flexion ranges in degrees - (finger, joint, (low, high))
+    EXTENDED_RANGE = np.array([
+        [[-10, 10], [0, 15], [0, 15]],
+        [[-10, 15], [0, 15], [0, 10]],
+        [[-10, 15], [0, 15], [0, 10]],
+        [[-10, 15], [0, 15], [0, 10]],
+        [[-10, 15], [0, 15], [0, 10]],
+    ], dtype=float)
+    FLEXED_RANGE = np.array([
+        [[20, 50], [30, 60], [30, 70]],
+        [[50, 90], [70, 110], [30, 70]],
+        [[50, 90], [70, 110], [30, 70]],
+        [[50, 90], [70, 110], [30, 70]],
+        [[50, 90], [70, 110], [30, 70]],
+    ], dtype=float)
+    # Index finger joint angles (degrees) used for pinch poses
+    PINCH_INDEX_ANGLES = np.array([35.0, 45.0, 20.0])
+    # Maximum thumb tip - index tip distance (palm units) labelled as pinch
+    PINCH_DISTANCE = 0.15
+    # Wrist -> middle finger MCP length in meters (world landmarks)
+    PALM_LENGTH_M = 0.09
+
+    def __init__(self,
+                 seed: Optional[int] = None,
+                 extended_rate: float = 0.5,
+                 pinch_rate: float = 0.15,
+                 left_hand_rate: float = 0.5,
+                 max_roll: float = 30.0,
+                 max_pitch: float = 30.0,
+                 max_yaw: float = 30.0,
+                 max_abduction: float = 8.0,
+                 scale_range: Tuple[float, float] = (0.15, 0.35),
+                 noise: float = 0.003,
+                 occlusion_rate: float = 0.0,
+                 occluded_landmark_rate: float = 0.3,
+                 occlusion_noise: float = 0.03,
+                 dtype: type = np.float32):
+        """
+        Init the generator.
+
+        Args:
+            seed (int): Seed of the random generator (None = random).
+            extended_rate (float): Probability of each finger being extended.
+            pinch_rate (float): Probability of a hand being generated pinching.
+            left_hand_rate (float): Probability of a hand being a left hand.
+            max_roll (float): Maximum in-plane rotation (degrees).
+            max_pitch (float): Maximum tilt forwards/backwards (degrees).
+            max_yaw (float): Maximum turn left/right (degrees).
+                Values above 90 also generate the back of the hand.
+            max_abduction (float): Maximum sideways spread of each finger (degrees).
+            scale_range (Tuple[float, float]): Palm length range in normalized image units.
+            noise (float): Standard deviation of the landmark noise (normalized units).
+            occlusion_rate (float): Probability of a hand being partially occluded.
+            occluded_landmark_rate (float): Probability of each landmark of an occluded hand being hidden.
+            occlusion_noise (float): Standard deviation of the noise of hidden landmarks,
+                mimicking the landmarks the model guesses behind an occluder.
+            dtype (type): Float type of the generated landmarks.
+        """
+        if not (0 < scale_range[0] <= scale_range[1]):
+            raise ValueError("Scale range must be positive and ordered.")
+        self.rng = np.random.default_rng(seed)
+        self.extended_rate = extended_rate
+        self.pinch_rate = pinch_rate
+        self.left_hand_rate = left_hand_rate
+        self.max_roll = np.radians(max_roll)
+        self.max_pitch = np.radians(max_pitch)
+        self.max_yaw = np.radians(max_yaw)
+        self.max_abduction = np.radians(max_abduction)
+        self.scale_range = scale_range
+        self.noise = noise
+        self.occlusion_rate = occlusion_rate
+        self.occluded_landmark_rate = occluded_landmark_rate
+        self.occlusion_noise = occlusion_noise
+        self.dtype = dtype
+
+    # ------------------------------------------------------------------
+    # Kinematics
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def forward_kinematics(cls, angles: np.ndarray, abduction: np.ndarray) -> np.ndarray:
+        """
+        Build canonical hands (right hand, palm facing the camera) from joint angles.
+
+        Args:
+            angles (np.ndarray): Flexion angles in radians, shape (n, 5, 3).
+            abduction (np.ndarray): Sideways spread in radians, shape (n, 5).
+
+        Returns:
+            np.ndarray: Landmarks in palm units, shape (n, 21, 3).
+        """
+        n = angles.shape[0]
+        phi = cls.DIRECTIONS + abduction
+        sin_phi, cos_phi = np.sin(phi), np.cos(phi)
+        zeros = np.zeros_like(phi)
+        # resting direction of the finger and the direction it bends to
+        rest = np.stack([sin_phi, -cos_phi, zeros], axis=-1)
+        across = np.stack([-cos_phi, -sin_phi, zeros], axis=-1)
+        palm_normal = np.array([0.0, 0.0, -1.0])
+        k = cls.IN_PLANE_BEND[:, None]
+        bend = k * across + np.sqrt(1 - k**2) * palm_normal
+
+        # each segment turns by the sum of the angles of the joints before it
+        total = np.cumsum(angles, axis=-1)[..., None]
+        directions = np.cos(total) * rest[:, :, None] + np.sin(total) * bend[:, :, None]
+        joints = cls.BASES[:, None] + np.cumsum(directions * cls.SEGMENTS[..., None], axis=2)
+
+        chains = np.empty((n, 5, 4, 3))
+        chains[:, :, 0] = cls.BASES
+        chains[:, :, 1:] = joints
+        landmarks = np.zeros((n, 21, 3))
+        landmarks[:, 1:] = chains.reshape(n, 20, 3)
+        return landmarks
+
+    @staticmethod
+    def rotation_matrices(roll: np.ndarray, pitch: np.ndarray, yaw: np.ndarray) -> np.ndarray:
+        """
+        Rotation matrices R = Rz(roll) @ Ry(yaw) @ Rx(pitch), shape (n, 3, 3).
+        """
+        cr, sr = np.cos(roll), np.sin(roll)
+        cp, sp = np.cos(pitch), np.sin(pitch)
+        cy, sy = np.cos(yaw), np.sin(yaw)
+        rotation = np.empty(roll.shape + (3, 3))
+        rotation[:, 0, 0] = cr * cy
+        rotation[:, 0, 1] = cr * sy * sp - sr * cp
+        rotation[:, 0, 2] = cr * sy * cp + sr * sp
+        rotation[:, 1, 0] = sr * cy
+        rotation[:, 1, 1] = sr * sy * sp + cr * cp
+        rotation[:, 1, 2] = sr * sy * cp - cr * sp
+        rotation[:, 2, 0] = -sy
+        rotation[:, 2, 1] = cy * sp
+        rotation[:, 2, 2] = cy * cp
+        return rotation
+
+    # ------------------------------------------------------------------
+    # Sampling
+    # ------------------------------------------------------------------
+
+    def sample(self, n: int) -> SyntheticHands:
+        """
+        Generate a batch of labelled hands.
+
+        Args:
+            n (int): Number of hands.
+
+        Returns:
+            SyntheticHands: Landmarks and ground truth labels.
+        """
+        rng = self.rng
+
+        # finger states and joint angles
+        extended = rng.random((n, 5)) < self.extended_rate
+        pinch = rng.random(n) < self.pinch_rate
+        extended[pinch, :2] = False
+        low = np.where(extended[..., None], self.EXTENDED_RANGE[..., 0], self.FLEXED_RANGE[..., 0])
+        high = np.where(extended[..., None], self.EXTENDED_RANGE[..., 1], self.FLEXED_RANGE[..., 1])
+        angles = np.radians(rng.uniform(low, high))
+        angles[pinch, 1] = np.radians(self.PINCH_INDEX_ANGLES + rng.uniform(-5, 5, (pinch.sum(), 3)))
+        abduction = rng.uniform(-self.max_abduction, self.max_abduction, (n, 5))
+
+        hands = self.forward_kinematics(angles, abduction)
+
+        # pinch: place the thumb tip on the index tip, with the IP joint in between
+        if pinch.any():
+            gap = rng.normal(size=(pinch.sum(), 3))
+            gap *= rng.uniform(0, 0.1, (pinch.sum(), 1)) / np.linalg.norm(gap, axis=1, keepdims=True)
+            thumb_mcp = hands[pinch, 2]
+            thumb_tip = hands[pinch, 8] + gap
+            hands[pinch, 4] = thumb_tip
+            hands[pinch, 3] = thumb_mcp + 0.55 * (thumb_tip - thumb_mcp) + np.array([0.0, 0.0, -0.08])
+        pinch = np.linalg.norm(hands[:, 4] - hands[:, 8], axis=1) < self.PINCH_DISTANCE
+
+        # handedness (left hands mirror the canonical right hand) and orientation
+        is_right = rng.random(n) >= self.left_hand_rate
+        hands[~is_right, :, 0] *= -1
+        rotation = self.rotation_matrices(
+            rng.uniform(-self.max_roll, self.max_roll, n),
+            rng.uniform(-self.max_pitch, self.max_pitch, n),
+            rng.uniform(-self.max_yaw, self.max_yaw, n),
+        )
+        hands = hands @ rotation.transpose(0, 2, 1)
+
+        # world landmarks: meters, origin at the hand center
+        world_landmarks = (hands - hands.mean(axis=1, keepdims=True)) * self.PALM_LENGTH_M
+
+        # project into the image (orthographic) keeping the whole hand inside the frame
+        scale = rng.uniform(*self.scale_range, n)
+        landmarks = hands * scale[:, None, None]
+        low = -landmarks[..., :2].min(axis=1)
+        high = 1 - landmarks[..., :2].max(axis=1)
+        landmarks[..., :2] += rng.uniform(np.minimum(low, high), np.maximum(low, high))[:, None]
+
+        # sensor noise and partial occlusion
+        if self.noise > 0:
+            landmarks += rng.normal(0, self.noise, landmarks.shape)
+        occluded = (rng.random((n, 1)) < self.occlusion_rate) & (rng.random((n, 21)) < self.occluded_landmark_rate)
+        if occluded.any():
+            landmarks[occluded] += rng.normal(0, self.occlusion_noise, (occluded.sum(), 3))
+
+        return SyntheticHands(
+            landmarks=landmarks.astype(self.dtype),
+            world_landmarks=world_landmarks.astype(self.dtype),
+            angles=angles.astype(self.dtype),
+            extended=extended,
+            pinch=pinch,
+            is_right=is_right,
+            occluded=occluded,
+        )
+
+    def iter_batches(self, total: int, batch_size: int = 100_000) -> Iterator[SyntheticHands]:
+        """
+        Generate `total` hands in batches, keeping memory bounded.
+
+        Args:
+            total (int): Number of hands to generate.
+            batch_size (int): Maximum number of hands per batch.
+
+        Yields:
+            SyntheticHands: One batch at a time.
+        """
+        for start in range(0, total, batch_size):
+            yield self.sample(min(batch_size, total - start))